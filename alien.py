@@ -1,12 +1,16 @@
-# Imports the pygame module before defining the class.
-import pygame
-
 # Imports the Sprite class from pygame
 from pygame.sprite import Sprite
 
+# Imports the shared image loader from the assets.py file
+from assets import load_image
+
 # Creates a class for Alien, that is a child-class of Sprite (Sprite in paraenthesis indicates Alien is a child class of sprite)
 class Alien(Sprite):
     """ A class to represent a single alien in the fleet"""
+    
+    # The attributes below live in fixed slots, so each alien's instance dictionary only holds
+    # what Sprite keeps there (Sprite has no __slots__, so the dictionary is still made).
+    __slots__ = ('screen', 'settings', 'image', 'rect', 'x', 'start_x')
 
     # This instance needs the current instance of AlienInvasion, ie using ai_game in the init. 
     def __init__(self, ai_game):
@@ -20,8 +24,8 @@ class Alien(Sprite):
         # Loads the settings of the Alien ship(s)
         self.settings = ai_game.settings
         
-        # Load the alien image and set its rect attribute
-        self.image = pygame.image.load('python_projects/alieninvasion/images/alien.bmp')
+        # Get the shared alien image from the asset cache and set its rect attribute
+        self.image = load_image('alien.bmp')
         self.rect = self.image.get_rect()
         
         # Start each new alien near the top left of the screen
@@ -30,22 +34,24 @@ class Alien(Sprite):
         
         # Store the alien's exact horizontal position
         self.x = float(self.rect.x)
+        # Where the alien started, which tells the fleet's column index which column it is in
+        self.start_x = self.rect.x
         
         
-    def check_edges(self):
-        """ Return True if alien is at edge of screen"""
+    def place(self, x, y):
+        """ Move the alien to its starting slot in a new fleet"""
         
-        screen_rect = self.screen.get_rect()
-        # The alien is at the right edge if the right attribute of its rect is greater than or equal to the right attribute of the screens rect. 
-        # The alien is at the left edge if its left value is less than or equal to 0.
-        if self.rect.right >= screen_rect.right or self.rect.left <= 0:
-            return True      
+        # Store the alien's exact horizontal position, then set the position of the alien's rect.
+        self.x = x
+        self.start_x = x
+        self.rect.x = x
+        self.rect.y = y
         
         
-    def update(self):
-        """ Move the alien to the right or left"""
+    def update(self, dt=1.0):
+        """ Move the alien to the right or left, for a tick dt long"""
         
         # Tracks the aliens position, using the self.x attribute and moves the aliens by multiplying the aliens speed by the value of fleet_direction
-        self.x += (self.settings.alien_speed * self.settings.fleet_direction)
+        self.x += (self.settings.alien_speed * self.settings.fleet_direction * dt)
         # Updates the position of the aliens rect
         self.rect.x = self.x
\ No newline at end of file
@@ -1,8 +1,11 @@
 # Will use tools from this module to exit game when player quits
 import sys
 
-# Imports instance of sleep, to pause game (time is in Python standard library)
-from time import sleep 
+# Times how long the game takes to show its first frame
+import time
+
+# When the game started loading, taken before pygame is imported since that is a large part of startup.
+_LOAD_START = time.perf_counter()
 
 # Contains functionality to make game
 import pygame
@@ -10,17 +13,9 @@ import pygame
 # Imports the Settings class from the settings.py file
 from settings import Settings
 
-# Imports the Ship class from the ship.py file
-from ship import Ship
-
-# Imports the Bullet class from the bullet.py file
-from bullet import Bullet
-
-# Imports the Alien class from the alien.py file
-from alien import Alien
-
-# Creates instance of GameStats
-from game_stats import GameStats
+# Imports the headless game rules and its tick events from the simulation.py file
+from simulation import (Simulation, Inputs, GAME_STARTED, ALIENS_KILLED, LEVEL_UP,
+                        SHIP_HIT, GAME_OVER)
 
 # Imports scoreboard from Scoreboard.py file
 from scoreboard import Scoreboard
@@ -28,6 +23,36 @@ from scoreboard import Scoreboard
 # Imports button from the Button.py file
 from button import Button
 
+# Imports the dirty-rect renderer from the dirty_renderer.py file
+from dirty_renderer import DirtyRenderer
+
+# Imports the frame clock from the game_clock.py file
+from game_clock import FrameClock
+
+# Imports the per-phase frame profiler from the profiler.py file
+from profiler import FrameProfiler
+
+# Imports the input recorder from the recording.py file
+from recording import InputRecorder
+
+# Imports the window presenter from the presenter.py file
+from presenter import Presenter
+
+# Imports the batched blit queue from the render_queue.py file
+from render_queue import RenderQueue
+
+# Imports the batched bullet blits from the bullet.py file
+from bullet import bullet_blits
+
+# Imports the background score saver from the persistence.py file
+from persistence import ScoreStore
+
+# Imports the buffered event log from the telemetry.py file
+from telemetry import TelemetryLog
+
+# Imports the game-state snapshots from the snapshot.py file
+from snapshot import take_snapshot, restore_snapshot
+
 
 # Creates a class to setup the game within
 class AlienInvasion:
@@ -35,62 +60,157 @@ class AlienInvasion:
     
     
     # self if a parameter that must always be called, when  declaring a new function or method.
-    def __init__(self):
-        """Initialize the game, and create game resources."""
-        
-        # Initializes PYGAME 
-        pygame.init()
-        # Calls the Settings class
-        self.settings = Settings()
-        
-        # Establishes screen size, from the settings.py file
-        self.screen = pygame.display.set_mode(
-            (self.settings.screen_width, self.settings.screen_height))
+    def __init__(self, settings=None):
+        """Initialize the game, and create game resources, using settings if given."""
+        
+        # Initializes only the parts of PYGAME the game uses; pygame.init() would also start audio, joysticks and the rest.
+        pygame.display.init()
+        pygame.font.init()
+        # Calls the Settings class, unless settings were passed in
+        self.settings = settings if settings is not None else Settings()
+        
+        # Opens the window, and establishes the screen size the game is drawn at, from the settings.py file
+        self.presenter = Presenter(self.settings)
+        self.screen = self.presenter.screen
         # Adds text caption to display
         pygame.display.set_caption("Alien Invasion")
         
-        # Create instance to store game statistics, and create a scoreboard.
-        self.stats = GameStats(self)
-        self.sb = Scoreboard(self)   
-        
-        # Call to Ship(), This ia a parameter that gives Ship access to the game's resources, such as the screen object
-        self.ship = Ship(self)
-        
-        # Calls the Bullets class
-        self.bullets = pygame.sprite.Group()
-        
-        # Call the Aliens class
-        self.aliens = pygame.sprite.Group()
-        
-        self._create_fleet()
+        # The simulation runs the game rules; this class only handles input and drawing.
+        # Its first fleet is made by _finish_startup(), after the Play screen is showing.
+        self.sim = Simulation(self.settings, self.screen, create_fleet=False)
+        # Shortcuts to the simulation's ship and statistics, used by the scoreboard.
+        self.stats = self.sim.stats
+        self.ship = self.sim.ship
+
+        # Loads the saved high score, and saves new ones in the background, if turned on in settings.py.
+        self.score_store = None
+        if self.settings.scores_path:
+            self.score_store = ScoreStore(self.settings.scores_path, self.settings.scores_write_interval)
+            self.stats.high_score = self.score_store.high_score
+
+        # Logs gameplay events for analytics, if turned on in settings.py; the file is written in the background.
+        self.telemetry = None
+        if self.settings.telemetry_path:
+            self.telemetry = TelemetryLog(self.settings.telemetry_path, self.settings.telemetry_capacity,
+                                          self.settings.telemetry_flush_interval)
+
+        # The scoreboard is also made by _finish_startup().
+        self.sb = None
+        # Seconds from when the game started loading to its first frame, once it has been shown.
+        self.time_to_first_frame = None
+
+        # One-off presses waiting to be handed to the next simulation tick.
+        self._fire_requested = False
+        self._play_requested = False
         
         # Make the Play button.
         self.play_button = Button(self, "Play")
         
         # Sets the background color, in RGB.
         self.bg_color = (230, 230, 230)
+        
+        # Collects each frame's blits of the ship, bullets and scoreboard, and draws them in one batch.
+        self.render_queue = RenderQueue(self.screen)
+        
+        # Draws only the changed parts of the screen, if turned on in settings.py
+        self.dirty_renderer = DirtyRenderer(self) if self.settings.dirty_rendering else None
+        
+        # Records every tick's input, if turned on in settings.py, so the session can be replayed.
+        self.recorder = InputRecorder(self.settings) if self.settings.record_path else None
+        
+        # Limits the frame rate and runs the simulation at a fixed tick rate.
+        self.clock = FrameClock(self.settings)
+        
+        # Times each phase of the main loop, if turned on in settings.py. When it is off nothing is timed at all.
+        self.profiler = None
+        if self.settings.profile:
+            self.profiler = FrameProfiler(self)
+            self.profiler.instrument_game(self)
        
         
     def run_game(self):
         """Start the main loop for the game."""
         
+        # Shows the Play screen straight away, then makes everything it didn't need.
+        self._draw_first_frame()
+        self._finish_startup()
+        
         # Starts a while loop.
         while True: 
             # Calls the _check_events() method on each pass of the loop 
             self._check_events()
             
-            if self.stats.game_active:
-                # Calls the ships update() method on each pass of the loop
-                self.ship.update()
-                # Calls the _update_bullets() method on each pass of the loop
-                self._update_bullets()
-                # Calls the _update_aliens() method on each pass of the loop
-                self._update_aliens()
+            # Waits for the next frame, so a fast machine doesn't run the loop flat out
+            self.clock.tick()
+            # Runs as many fixed ticks as the time since the last frame calls for
+            while self.clock.consume_tick():
+                # Advances the game by one tick, using the input gathered by _check_events()
+                events = self.sim.step(self._collect_inputs())
+                # Updates the scoreboard for anything that happened during the tick
+                self._handle_sim_events(events)
                 
-            # Calls the _update_screen() method on each pass of the loop
-            self._update_screen()
+            # Calls the _update_screen() method on each pass of the loop, blending between ticks if turned on
+            alpha = self.clock.alpha if self.settings.interpolate_rendering else 1.0
+            self._update_screen(alpha)
+            
+            # Builds the next fleet while the frame has time to spare, after it is already showing
+            self._prepare_ahead()
+            
+            # Records how long each phase of this frame took
+            if self.profiler:
+                self.profiler.end_frame()
 
 
+    def _draw_first_frame(self):
+        """Show the Play screen, with only the ship and button, and note how long startup took"""
+        self.screen.fill(self.settings.bg_color)
+        self.ship.blitme()
+        self.play_button.draw_button()
+        self.presenter.flip()
+        
+        self.time_to_first_frame = time.perf_counter() - _LOAD_START
+        if self.settings.report_startup:
+            print('First frame shown {:.0f} ms after loading started'.format(self.time_to_first_frame * 1000))
+            
+            
+    def _finish_startup(self):
+        """Make the scoreboard and the fleet shown behind the Play button, if they haven't been made yet"""
+        # Also called by every method that needs them, so games driven without run_game() finish starting up on first use.
+        if self.sb is not None:
+            return
+        # Create a scoreboard.
+        self.sb = Scoreboard(self)
+        # A game that has already started made its own fleet.
+        if not self.stats.game_active and not self.sim.fleet:
+            self.sim.create_fleet()
+            
+            
+    def take_snapshot(self):
+        """Return the state of the game as bytes, for restore_snapshot() to go back to"""
+        return take_snapshot(self.sim)
+        
+        
+    def restore_snapshot(self, data):
+        """Put the game back into the state saved by take_snapshot(), and redraw the scoreboard to match"""
+        # Startup is finished first, so the fleet it makes can't replace the restored one.
+        self._finish_startup()
+        restore_snapshot(self.sim, data)
+        self.sb.prep_score()
+        self.sb.prep_high_score()
+        self.sb.prep_level()
+        self.sb.prep_ships()
+        # The mouse is only hidden while a game is running.
+        pygame.mouse.set_visible(not self.stats.game_active)
+        if self.dirty_renderer:
+            self.dirty_renderer.request_full_redraw()
+            
+            
+    def _prepare_ahead(self):
+        """Build the next fleet, if it isn't built yet, so clearing a wave or losing a ship doesn't cost a slow frame"""
+        # Called after the frame is shown, in the time the clock would otherwise spend waiting.
+        self.sim.prepare_next_fleet()
+            
+            
     def _check_events(self):
         """Respond to keypresses and mouse events"""
         
@@ -99,16 +219,19 @@ class AlienInvasion:
             # If event triggers quit
             if event.type == pygame.QUIT:
                 # Exits system
-                sys.exit()
+                self._quit()
             # Else if, detects a KEYDOWN event (event where Key is pressed down)
             elif event.type == pygame.KEYDOWN:
                self._check_keydown_events(event)
             # Else if, detects when key released        
             elif event.type == pygame.KEYUP:
                 self._check_keyup_events(event)
+            # The window was uncovered, so the next frame has to redraw all of it.
+            elif event.type == pygame.VIDEOEXPOSE and self.dirty_renderer:
+                self.dirty_renderer.request_full_redraw()
             # Detects if player clicks mouse button, anywhere on screen.    
             elif event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_pos = pygame.mouse.get_pos()
+                mouse_pos = self.presenter.to_screen(pygame.mouse.get_pos())
                 self._check_play_button(mouse_pos)
     
     
@@ -117,26 +240,8 @@ class AlienInvasion:
         button_clicked = self.play_button.rect.collidepoint(mouse_pos)
         # Deactivates button when game is active. 
         if button_clicked and not self.stats.game_active:
-            # Reset the game settings.
-            self.settings.initialize_dynamic_settings()
-            
-            # Reset the game statistics. 
-            self.stats.reset_stats()
-            self.stats.game_active = True
-            self.sb.prep_score()
-            self.sb.prep_level()
-            self.sb.prep_ships()
-            
-            # Get rid of any remaining aliens and bullets.
-            self.aliens.empty()
-            self.bullets.empty()
-            
-            # Create a new fleet and center the ship.
-            self._create_fleet()
-            self.ship.center_ship()
-            
-            # Hide the mouse cursor. 
-            pygame.mouse.set_visible(False)
+            # The simulation resets and starts the game on its next tick.
+            self._play_requested = True
                 
                     
     def _check_keydown_events(self, event):
@@ -153,13 +258,33 @@ class AlienInvasion:
         # Check Q key for event
         elif event.key == pygame.K_q:
             # Exits system
-            sys.exit()
+            self._quit()
         # Check for SPACE key event
         elif event.key == pygame.K_SPACE:
-            # Fires bullet from ship
-            self._fire_bullet()
+            # Fires bullet from ship on the next tick
+            self._fire_requested = True
+        # Check F3 key event, when the profiler is on
+        elif event.key == pygame.K_F3 and self.profiler:
+            # Shows or hides the profiler overlay
+            self.profiler.toggle_overlay()
+            if self.dirty_renderer:
+                # Makes sure a hidden overlay gets erased from the whole screen
+                self.dirty_renderer.request_full_redraw()
         
                
+    def _quit(self):
+        """Save the profile and recording, if they are on, and exit the game"""
+        if self.profiler and self.settings.profile_export:
+            self.profiler.export(self.settings.profile_export)
+        if self.recorder:
+            self.recorder.save(self.settings.record_path)
+        if self.score_store:
+            self.score_store.close()
+        if self.telemetry:
+            self.telemetry.close()
+        sys.exit()
+        
+        
     def _check_keyup_events(self, event):
         """Respond to key releases"""
         
@@ -173,196 +298,96 @@ class AlienInvasion:
             self.ship.moving_left = False
             
     
-    def _create_fleet(self):
-        """ Create the fleet of aliens"""
-        # Create an alien and find the number of aliens in a row.
-        # Spacing between each alien is equal to one alien width.
-        # Create an alien
-        alien = Alien(self)
-        # Get alien's width & height from its rect attribute
-        alien_width, alien_height = alien.rect.size 
-        # Calculates the horizontal space available for aliens in a row. 
-        available_space_x = self.settings.screen_width - (2 * alien_width)
-        # Calculates the number of aliens that can fit into that row space.
-        number_aliens_x = available_space_x // (2 * alien_width)
-        
-        # Determine the number of rows of aliens that fit on the screen.
-        ship_height = self.ship.rect.height
-        # Calculates available space for rows on screen.  
-        available_space_y = (self.settings.screen_height - (3 * alien_height) - ship_height)
-        # Calcualates number of row that can fit on screen.
-        number_rows = available_space_y // (2 * alien_height)
-        
-        # Create the full fleet of aliens.
-        # Creates the numbers of rows on screen. 
-        for row_number in range(number_rows):
-        # Create the first row of aliens. 
-            for alien_number in range(number_aliens_x):
-                self._create_alien(alien_number, row_number)
-    
-    
-    def _check_fleet_edges(self):
-        """ Respond appropriately if any aliens have reached an edge"""
-        # Loops through the fleet and calls check_edges() on each  alien        
-        for alien in self.aliens.sprites():
-            if alien.check_edges():
-                # If check_edges() returns TRUE, fleet is at edge and reverses direction. 
-                self._change_fleet_direction()
-                break
-            
-    
-    def _change_fleet_direction(self):
-        """ Drop the entire fleet and change the fleet's direction"""
-        for alien in self.aliens.sprites():
-            # Loops through all the aliens and dropeach one using the setting fleet_drop_speed
-            alien.rect.y += self.settings.fleet_drop_speed
-        # Changes fleet direction by multiplying valuse of fleet_direction current value by -1
-        self.settings.fleet_direction *= -1
-        
-    
-    def _create_alien(self, alien_number, row_number):
-        """ Creates an alien and places it in the row"""
-        alien = Alien(self)
-        alien_width, alien_height = alien.rect.size 
-        # Calculates the HORIZONTAL space an alien takes up plus the empty space between it and the last, starting at zero.
-        alien.x = alien_width + 2 * alien_width * alien_number
-        # Sets the position of the alien's rect.
-        alien.rect.x = alien.x
-        # # Calculates the VERTICLE space an alien takes up plus the empty space between it and the last, starting at zero.
-        alien.rect.y = alien.rect.height + 2 * alien.rect.height * row_number
-        # Add the newly created alien to the sprite group.
-        self.aliens.add(alien)
-    
-    
-    def _update_aliens(self):
-        """ Check if the fleet is at the edge, then update the positions of all aliens in the fleet"""
-        # Calls the _check_fleet_edges
-        self._check_fleet_edges()     
-        # Update alien fleet  
-        self.aliens.update()
-        
-        # Look for alien-ship collisions.
-        if pygame.sprite.spritecollideany(self.ship, self.aliens):
-            self._ship_hit()
-            
-        # Look for aliens hitting the bottom of the screen.
-        self._check_aliens_bottom()
-    
-    
-    def _ship_hit(self):
-        """ Respond to the ship being hit by an alien"""
-        # Loop checks the players ship count left, to continue to next ship if TRUE.
-        if self.stats.ships_left > 0:
-            # Decrement ships_left, and update scoreboard.
-            self.stats.ships_left -= 1
-            self.sb.prep_ships()
-            
-            # Get rid of any remaining aliens and bullets.
-            self.aliens.empty()
-            self.bullets.empty()
-            
-            # Create a new fleet and center the ship.
-            self._create_fleet()
-            self.ship.center_ship()
-            
-            # Pauses game for time specified 
-            sleep(0.5)
-            
-        # If zero ships left, active game changed to FALSE.
-        else:
-            self.stats.game_active = False
-            # Makes mouse visible, when game becomes inactive. 
-            pygame.mouse.set_visible(True)
-    
-    
-    def _check_aliens_bottom(self):
-        """Check is any aliens have reached the bottom of the screen"""
-        screen_rect = self.screen.get_rect()
-        for alien in self.aliens.sprites():
-            # Alien reaches the bottom when its value is greater than or equal to the screen value. 
-            if alien.rect.bottom >= screen_rect.bottom:
-                # Treat this the same as if the ship got hit.
-                self._ship_hit()
-                break
-    
-            
-    def _fire_bullet(self):
-        """ Create a new bullet and add it to the bullets group"""
-        
-        # When fired, checks that len(self.bullets) is less than the bullets allowed in settings.py, if so creates a new bullet.
-        if len(self.bullets) < self.settings.bullets_allowed:
-            # Creates new instance of Bullet
-            new_bullet = Bullet(self)
-            # Adds new bullet to the group
-            # add() method is similar to append(), but its a method written specifically for Pygame groups
-            self.bullets.add(new_bullet)
-    
-    
-    def _update_bullets(self):
-        """ Update position of bullets and get rid of old bullets"""
-        
-        # Update bullet positions
-        self.bullets.update()
-        # Get rid of bullets that have disappeared, by creating a loop for the copy() method by allowing us to modify them while inside the loop
-        for bullet in self.bullets.copy():
-            # Checks each bullet to see if it has disappeared off the top of the screen
-            if bullet.rect.bottom <= 0:
-                # Removes bullets that have disappeared from the screen
-                self.bullets.remove(bullet)
-        # Call to print() how many bullets exist in the game currently and verify deletion once at top of screen
-        # print(len(self.bullets)) -- Took this out after testing.
-        
-        self._check_bullet_alien_collisions()
-        
-        
-    def _check_bullet_alien_collisions(self):
-        """ Respond to bullet-alien collisions"""
-        
-        # Remove any bullets and aliens that have collided
-        collisions = pygame.sprite.groupcollide(self.bullets, self.aliens, True, True)
-        
-        # Adds points to score as alien ships shot down. 
-        if collisions:
-            for aliens in collisions.values():
-                self.stats.score += self.settings.alien_points * len(aliens)
-            self.sb.prep_score()
-            self.sb.check_high_score()
-        
-        if not self.aliens:
-            # Destroy existing bullets and create new fleet
-            self.bullets.empty()
-            self._create_fleet()
-            self.settings.increase_speed()
+    def _collect_inputs(self):
+        """Gather this frame's input into one tick of input for the simulation"""
+        inputs = Inputs(self.ship.moving_left, self.ship.moving_right,
+                        self._fire_requested, self._play_requested)
+        # Fire and Play are one-off presses, so they only last for a single tick.
+        self._fire_requested = False
+        self._play_requested = False
+        if self.recorder:
+            self.recorder.record(inputs)
+        return inputs
+
 
-            # Increase level. 
-            self.stats.level += 1
-            self.sb.prep_level()
+    def _handle_sim_events(self, events):
+        """ Update the scoreboard and mouse for the events raised by the last tick"""
+        self._finish_startup()
+        if self.telemetry and events:
+            self._log_events(events)
+        for event in events:
+            if event == GAME_STARTED:
+                self.sb.prep_score()
+                self.sb.prep_level()
+                self.sb.prep_ships()
+                # Hide the mouse cursor.
+                pygame.mouse.set_visible(False)
+            elif event == ALIENS_KILLED:
+                self.sb.prep_score()
+                self.sb.check_high_score()
+                # Only hands the score over; the file is written in the background.
+                if self.score_store:
+                    self.score_store.submit_high_score(self.stats.high_score)
+            elif event == LEVEL_UP:
+                self.sb.prep_level()
+            elif event == SHIP_HIT:
+                self.sb.prep_ships()
+            elif event == GAME_OVER:
+                # Makes mouse visible, when game becomes inactive.
+                pygame.mouse.set_visible(True)
+                if self.score_store:
+                    self.score_store.record_session(self.stats.score, self.stats.level)
+
+
+    def _log_events(self, events):
+        """ Add the events raised by the last tick to the telemetry log"""
+        stats = self.stats
+        for event in events:
+            # Kills record how many aliens died; everything else records the ships left.
+            value = self.sim.kills if event == ALIENS_KILLED else stats.ships_left
+            self.telemetry.log(event, self.sim.ticks, stats.level, value, stats.score)
+
+
+    def _update_screen(self, alpha=1.0):
+        """ Update images on the screen, alpha of the way between ticks, and flip to the new screen"""
         
-    
-    def _update_screen(self):
-        """ Update images on the screen, and flip to the new screen"""
+        self._finish_startup()
+        
+        # The dirty-rect renderer redraws and updates only what changed.
+        if self.dirty_renderer:
+            self.dirty_renderer.draw(alpha)
+            # The overlay isn't tracked by the renderer, so it pushes its own rect.
+            if self.profiler and self.profiler.overlay_visible:
+                self.presenter.update(self._draw_profiler_overlay())
+            return
         
         # Redraw the screen during each pass through the loop, from the settings.py file
         self.screen.fill(self.settings.bg_color)
-        # Draws the ship on the screen.
-        self.ship.blitme()
-        
-        # Creates loop through the sprites in bullets
-        for bullet in self.bullets.sprites():
-            # Calls draw_bullets on each pass of the loop
-            bullet.draw_bullet()
-        # Draws the alien on the screen
-        self.aliens.draw(self.screen)
+        # Draws the aliens on the screen first, since the cached fleet covers its gaps with background
+        self.sim.fleet.draw(self.screen, alpha)
         
-        # Draw the score information.
-        self.sb.show_score()
+        # Queues the ship, every bullet and the score information, then draws them all in one batch.
+        queue = self.render_queue
+        queue.add(*self.ship.blit_item(alpha))
+        queue.extend(bullet_blits(self.sim.bullets.sprites(), alpha))
+        queue.extend(self.sb.hud_blits())
+        queue.flush()
         
         # Draw the play button if the game is inactive.
         if not self.stats.game_active:
             self.play_button.draw_button()
+            
+        # Draw the profiler overlay if it is showing.
+        if self.profiler and self.profiler.overlay_visible:
+            self._draw_profiler_overlay()
                 
         # Make the most recently drawn screen visible. 
-        pygame.display.flip()
+        self.presenter.flip()
+        
+            
+    def _draw_profiler_overlay(self):
+        """ Draw the profiler overlay under the scoreboard, and return the rect it covers"""
+        return self.profiler.draw_overlay(self.sb.level_rect.bottom + 10)
         
             
 if __name__ == '__main__':
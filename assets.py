@@ -0,0 +1,159 @@
+# Gives access to the folder this file lives in, so image paths work from any working directory
+import os
+
+# Maps the asset bundle into memory, so its pixels are used in place instead of read and decoded
+import mmap
+
+# Reads the asset bundle's header and index
+import struct
+
+# Contains functionality to make game
+import pygame
+
+
+# Folder that holds the game's images, found relative to this file instead of the current directory.
+IMAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'images')
+
+# Every image loaded so far, keyed by file name and whether it keeps its alpha, so each file is
+# only read from disk once for each way it is used.
+_image_cache = {}
+
+# Keys of the cached images that have already been converted to the display's pixel format.
+_converted = set()
+
+
+# Bundle of every image's raw pixels, written by build_assets.py. When it is there, images are
+# made straight from its memory-mapped pixels instead of being read and decoded one file at a time.
+BUNDLE_PATH = os.path.join(IMAGES_DIR, 'images.bundle')
+BUNDLE_MAGIC = b'AIAB'
+BUNDLE_VERSION = 1
+
+# Pixels are stored 4 bytes each in this order, the same layout as the usual 32-bit display.
+BUNDLE_FORMAT = 'BGRA'
+
+# Bundle header: magic, version and number of images. Each image then has an index entry, followed
+# by its name: name length, width, height, the source file's modification time in nanoseconds,
+# and where its pixels start.
+BUNDLE_HEADER = struct.Struct('<4sHH')
+BUNDLE_ENTRY = struct.Struct('<HIIqQ')
+
+# The mapped bundle and its index, None before it is first looked for, and False if there isn't one.
+_bundle = None
+
+# Keys of the cached images whose pixels are in the bundle.
+_bundled = set()
+
+
+def image_path(filename):
+    """Return the full path to an image in the images folder."""
+    return os.path.join(IMAGES_DIR, filename)
+
+
+def load_image(filename, alpha=False):
+    """Return the shared Surface for an image, loading it the first time it is asked for."""
+    # The same file with and without alpha are different Surfaces, so each is cached on its own.
+    key = (filename, alpha)
+    image = _image_cache.get(key)
+    if image is None:
+        image = _load_bundled(filename, alpha)
+        if image is None:
+            image = pygame.image.load(image_path(filename))
+        else:
+            _bundled.add(key)
+        _image_cache[key] = image
+    # convert() needs a display surface to match, so a headless game keeps the loaded format.
+    display = pygame.display.get_surface()
+    if key not in _converted and display is not None:
+        # Bundled pixels that already match the display are used in place, since converting would copy them.
+        if not (key in _bundled and _matches_display(image, display)):
+            # Matching the display's pixel format makes every later blit much faster.
+            image = image.convert_alpha() if alpha else image.convert()
+            _image_cache[key] = image
+            _bundled.discard(key)
+        _converted.add(key)
+    return image
+
+
+def clear_cache():
+    """Forget every cached image, for example after the display mode changes."""
+    _image_cache.clear()
+    _converted.clear()
+    _bundled.clear()
+
+
+def read_bundle_index(data):
+    """Return the index of a bundle's contents as {name: (offset, width, height, mtime)}, or None if it isn't a bundle.
+
+    Images whose pixels would run past the end of data are left out, so a cut-short bundle only
+    loses the images it no longer holds.
+    """
+    if len(data) < BUNDLE_HEADER.size:
+        return None
+    magic, version, count = BUNDLE_HEADER.unpack_from(data, 0)
+    if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION:
+        return None
+    index = {}
+    position = BUNDLE_HEADER.size
+    try:
+        for _ in range(count):
+            name_length, width, height, mtime, offset = BUNDLE_ENTRY.unpack_from(data, position)
+            position += BUNDLE_ENTRY.size
+            name = bytes(data[position:position + name_length]).decode('utf-8')
+            position += name_length
+            if offset + width * height * 4 <= len(data):
+                index[name] = (offset, width, height, mtime)
+    except (struct.error, UnicodeDecodeError):
+        # The index itself is cut short or damaged, so none of it can be trusted.
+        return None
+    return index
+
+
+def _open_bundle():
+    """Map the bundle into memory the first time it is needed, and return it with its index."""
+    global _bundle
+    if _bundle is None:
+        _bundle = False
+        try:
+            with open(BUNDLE_PATH, 'rb') as f:
+                # Copy-on-write: pages stay shared by every game process mapping the same bundle
+                # until a Surface made from them is drawn on, which copies only that page.
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        except (OSError, ValueError):
+            # No bundle, or an empty one; the image files are loaded instead.
+            return _bundle
+        index = read_bundle_index(data)
+        if index is not None:
+            _bundle = (data, index)
+    return _bundle
+
+
+def _load_bundled(filename, alpha):
+    """Return a Surface made in place from the bundle's pixels for filename, or None if it isn't bundled."""
+    bundle = _open_bundle()
+    if not bundle:
+        return None
+    data, index = bundle
+    entry = index.get(filename)
+    if entry is None:
+        return None
+    offset, width, height, mtime = entry
+    # An image changed since the bundle was built is loaded from its file instead.
+    try:
+        if os.stat(image_path(filename)).st_mtime_ns > mtime:
+            return None
+    except OSError:
+        pass
+
+    # frombuffer() shares the mapped pixels rather than copying them.
+    pixels = memoryview(data)[offset:offset + width * height * 4]
+    image = pygame.image.frombuffer(pixels, (width, height), BUNDLE_FORMAT)
+    if not alpha:
+        # The stored alpha is always opaque for these images, so blits skip blending.
+        image.set_alpha(None)
+    return image
+
+
+def _matches_display(image, display):
+    """Return True if image's pixels are laid out the same as the display's."""
+    return (image.get_bitsize() == display.get_bitsize()
+            and image.get_masks()[:3] == display.get_masks()[:3])
@@ -0,0 +1,159 @@
+"""Play many headless games at once on every CPU core, and report how they went.
+
+Usage:
+    python batch_runner.py --games 1000                      play 1000 games with the scripted player
+    python batch_runner.py --policy random --seed 7          play with seeded random players
+    python batch_runner.py --set speedup_scale=1.2           try a different difficulty curve
+    python batch_runner.py --output results.jsonl            also write one line per game
+"""
+
+# Reads the command line options
+import argparse
+
+# Turns --set values into Python values
+import ast
+
+# Writes the per-game results
+import json
+
+# Runs the games in separate processes, so they use every core
+import multiprocessing
+
+# Picks the SDL video driver
+import os
+
+# Summarizes the results
+import statistics
+
+# Times the batch
+import time
+
+# Headless games never open a window, in this process or in the workers.
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+# Imports the settings, the headless simulation and the players
+from settings import Settings
+from simulation import Simulation
+from policies import POLICIES
+
+
+class TunedSettings(Settings):
+    """The default settings with a batch's changes applied, kept through every new game."""
+
+    def __init__(self, changes):
+        """Create the settings with changes, a dict of setting names and values, applied."""
+        self.changes = changes
+        super().__init__()
+
+
+    def initialize_dynamic_settings(self):
+        """Reset the settings that change during a game, then apply the batch's changes again."""
+        # Pressing Play resets the dynamic settings, which would otherwise undo changes such as alien_speed.
+        super().initialize_dynamic_settings()
+        for name, value in self.changes.items():
+            setattr(self, name, value)
+
+
+def play_game(job):
+    """Play one headless game to the end, or to the tick limit, and return how it went.
+
+    job is (game number, settings changes, policy name, seed, tick limit). This runs in a
+    worker process, so it takes and returns only plain values.
+    """
+    number, changes, policy, seed, max_ticks = job
+    sim = Simulation(TunedSettings(changes))
+
+    if policy == 'random':
+        player = POLICIES[policy](seed=seed, keep_playing=False)
+    else:
+        player = POLICIES[policy](keep_playing=False)
+
+    # The first tick presses Play; the game is over once it stops being active after that.
+    sim.step(player(sim))
+    while sim.stats.game_active and sim.ticks < max_ticks:
+        sim.step(player(sim))
+
+    return {
+        'game': number,
+        'seed': seed,
+        'level': sim.stats.level,
+        'score': sim.stats.score,
+        'ticks': sim.ticks,
+        'finished': not sim.stats.game_active,
+    }
+
+
+def summarize(results):
+    """Return the mean, median, lowest and highest level, score and ticks survived."""
+    summary = {}
+    for key in ('level', 'score', 'ticks'):
+        values = [result[key] for result in results]
+        summary[key] = {
+            'mean': statistics.mean(values),
+            'median': statistics.median(values),
+            'min': min(values),
+            'max': max(values),
+        }
+    summary['unfinished'] = sum(not result['finished'] for result in results)
+    return summary
+
+
+def parse_change(text):
+    """Turn a name=value command line option into a (name, value) pair."""
+    name, _, value = text.partition('=')
+    if not hasattr(Settings(), name):
+        raise argparse.ArgumentTypeError('unknown setting: {}'.format(name))
+    try:
+        return name, ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        raise argparse.ArgumentTypeError('bad value for {}: {!r}'.format(name, value))
+
+
+def main():
+    """Play the batch of games and print each result as it arrives, then the summary."""
+    parser = argparse.ArgumentParser(description='Play many headless Alien Invasion games in parallel.')
+    parser.add_argument('--games', type=int, default=100, help='number of games to play')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='worker processes (default: one per core)')
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='sweep', help='player used in every game')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the first random player; each game adds its number')
+    parser.add_argument('--max-ticks', type=int, default=60 * 60 * 10,
+                        help='ticks after which an unfinished game is stopped (default: 10 minutes)')
+    parser.add_argument('--set', type=parse_change, action='append', default=[], metavar='NAME=VALUE',
+                        help='change a setting for every game (can be repeated)')
+    parser.add_argument('--output', help='write each game\'s result to this file as a line of JSON')
+    parser.add_argument('--quiet', action='store_true', help='only print the summary')
+    args = parser.parse_args()
+
+    changes = dict(args.set)
+    jobs = [(number, changes, args.policy, args.seed + number, args.max_ticks) for number in range(args.games)]
+
+    results = []
+    output = open(args.output, 'w') if args.output else None
+    start = time.perf_counter()
+    with multiprocessing.Pool(args.workers) as pool:
+        # Results are handled as each game finishes, rather than once the whole batch is done.
+        for result in pool.imap_unordered(play_game, jobs):
+            results.append(result)
+            if output:
+                output.write(json.dumps(result) + '\n')
+            if not args.quiet:
+                print('game {game:>5}: level {level:>3}, score {score:>8}, {ticks:>7} ticks'.format(**result))
+    elapsed = time.perf_counter() - start
+    if output:
+        output.close()
+
+    if not results:
+        return
+    summary = summarize(results)
+    print()
+    print('{:<8}{:>12}{:>12}{:>10}{:>10}'.format('', 'mean', 'median', 'min', 'max'))
+    for key in ('level', 'score', 'ticks'):
+        print('{:<8}{mean:>12.1f}{median:>12.1f}{min:>10}{max:>10}'.format(key, **summary[key]))
+    total_ticks = sum(result['ticks'] for result in results)
+    print('\n{} games ({} stopped at the tick limit) in {:.2f}s: {:.1f} games/s, {:.0f} ticks/s'.format(
+        len(results), summary['unfinished'], elapsed, len(results) / elapsed, total_ticks / elapsed))
+
+
+if __name__ == '__main__':
+    main()
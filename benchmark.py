@@ -0,0 +1,225 @@
+"""Run scripted scenarios through the game loop and report frames per second and allocations.
+
+Usage:
+    python benchmark.py                           run every scenario
+    python benchmark.py --scenario bullet_storm   run one scenario
+    python benchmark.py --save-baseline           store the results as the new baseline
+    python benchmark.py --compare                 fail if any scenario regressed against the baseline
+    python benchmark.py --snapshot mid.snapshot   start every scenario from a snapshot (see snapshot.py)
+"""
+
+# Reads the command line options
+import argparse
+
+# Reads and writes the baseline file
+import json
+
+# Finds this file's folder, and picks the SDL video driver
+import os
+
+# Exits with an error code when a regression is found
+import sys
+
+# High-resolution timer used to time the frames
+import time
+
+# Measures memory allocated during each frame
+import tracemalloc
+
+# Benchmarks never open a real window.
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+# Contains functionality to make game
+import pygame
+
+# Imports the game, its settings, and the simulation's inputs and events
+from alien_invasion import AlienInvasion
+from settings import Settings
+from simulation import Inputs, ALIENS_KILLED
+
+# Imports the scripted player from the policies.py file
+from policies import SweepAndFire
+
+
+# Where the baseline results are kept, next to this file.
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+
+
+def clear_wave(game, frame):
+    """Remove the whole fleet, so this frame runs the wave-clear path."""
+    game.sim.fleet.empty()
+    # Speeds grow with every wave, so they are reset before they reach absurd values.
+    if frame % 20 == 0:
+        game.settings.initialize_dynamic_settings()
+
+
+def shoot_down_wave(game, frame):
+    """Shoot down the whole fleet once every 60 frames, so those frames clear a wave that was shot, among ordinary frames."""
+    if frame % 60 == 0:
+        # One screen-sized shot kills every alien the way bullets do, erasing each one from the cached fleet.
+        shot = pygame.sprite.Sprite()
+        shot.rect = game.screen.get_rect()
+        game.sim.fleet.collide_bullets(pygame.sprite.Group(shot))
+        if frame % 1200 == 0:
+            game.settings.initialize_dynamic_settings()
+
+
+def score_burst(game, frame):
+    """Score several kills, so this frame re-renders the scoreboard."""
+    game.stats.score += game.settings.alien_points * 7
+    game._handle_sim_events([ALIENS_KILLED])
+
+
+# Each scenario: the settings it changes, and an optional hook run before every frame.
+SCENARIOS = {
+    'default_fleet': ({}, None),
+    'max_fleet': ({'screen_width': 3840, 'screen_height': 2160}, None),
+    'scaled_4k': ({'scale_mode': 'software', 'window_size': (3840, 2160)}, None),
+    'bullet_storm': ({'bullets_allowed': 300}, None),
+    'wave_clear': ({}, clear_wave),
+    'wave_clear_paced': ({}, shoot_down_wave),
+    'scoreboard_heavy': ({}, score_burst),
+}
+
+
+def make_game(changes, snapshot=None):
+    """Return a game built on settings with the given changes, with a game already started, or restored from snapshot."""
+    settings = Settings()
+    # Benchmarks leave the saved scores alone.
+    settings.scores_path = None
+    for name, value in changes.items():
+        setattr(settings, name, value)
+    game = AlienInvasion(settings)
+    game.sim.step(Inputs(play=True))
+    if snapshot is not None:
+        game.restore_snapshot(snapshot)
+    # A real game gets to build its next fleet on the frames before the first wave is cleared.
+    game._prepare_ahead()
+    return game
+
+
+def run_frame(game, player, frame, hook):
+    """Run one frame of the game loop, without waiting on the frame clock, and return the seconds it took to show."""
+    if hook:
+        hook(game, frame)
+    start = time.perf_counter()
+    game._check_events()
+    events = game.sim.step(player(game))
+    game._handle_sim_events(events)
+    game._update_screen()
+    shown = time.perf_counter() - start
+    # The work the game loop does after the frame is showing, in time the clock would spend waiting.
+    game._prepare_ahead()
+    return shown
+
+
+def run_scenario(name, frames, alloc_frames, snapshot=None):
+    """Run a scenario and return its frames per second, slowest frame, and bytes allocated per frame."""
+    changes, hook = SCENARIOS[name]
+    game = make_game(changes, snapshot)
+    player = SweepAndFire()
+
+    # Timed pass, with nothing else measuring.
+    worst = 0.0
+    start = time.perf_counter()
+    for frame in range(frames):
+        worst = max(worst, run_frame(game, player, frame, hook))
+    elapsed = time.perf_counter() - start
+
+    # Allocation pass: the highest memory use above each frame's starting point is what it allocated.
+    tracemalloc.start()
+    allocated = 0
+    for frame in range(alloc_frames):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        run_frame(game, player, frame, hook)
+        allocated += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+
+    return {
+        'frames': frames,
+        'fps': frames / elapsed,
+        'ms_per_frame': elapsed / frames * 1000,
+        'worst_ms': worst * 1000,
+        'alloc_bytes_per_frame': allocated / max(alloc_frames, 1),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Return a description of every scenario that got slower or allocates more than the baseline allows."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if result['fps'] < base['fps'] * (1 - tolerance):
+            regressions.append('{}: {:.0f} fps, baseline {:.0f} fps'.format(name, result['fps'], base['fps']))
+        # A few hundred bytes of noise is allowed, so tiny allocation counts don't flap.
+        allowed = base['alloc_bytes_per_frame'] * (1 + tolerance) + 256
+        if result['alloc_bytes_per_frame'] > allowed:
+            regressions.append('{}: {:.0f} B/frame allocated, baseline {:.0f} B/frame'.format(
+                name, result['alloc_bytes_per_frame'], base['alloc_bytes_per_frame']))
+    return regressions
+
+
+def main():
+    """Run the chosen scenarios and report, save or compare the results."""
+    parser = argparse.ArgumentParser(description='Benchmark the Alien Invasion game loop.')
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help='scenario to run (can be repeated; default: all)')
+    parser.add_argument('--frames', type=int, default=2000, help='frames timed per scenario')
+    parser.add_argument('--alloc-frames', type=int, default=200,
+                        help='frames measured for allocations per scenario')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='baseline results file')
+    parser.add_argument('--save-baseline', action='store_true', help='save these results as the baseline')
+    parser.add_argument('--compare', action='store_true', help='exit with an error if any scenario regressed')
+    parser.add_argument('--snapshot', help='snapshot file every scenario starts from, instead of level 1')
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help='fraction a result may be worse than the baseline (default 0.10)')
+    args = parser.parse_args()
+
+    snapshot = None
+    if args.snapshot:
+        with open(args.snapshot, 'rb') as f:
+            snapshot = f.read()
+
+    results = {}
+    print('{:<18}{:>10}{:>12}{:>12}{:>16}'.format('scenario', 'fps', 'ms/frame', 'worst ms', 'alloc B/frame'))
+    for name in args.scenario or SCENARIOS:
+        try:
+            result = run_scenario(name, args.frames, args.alloc_frames, snapshot)
+        except ValueError as error:
+            # A snapshot only fits the scenarios played at its screen size.
+            print('{:<18}skipped: {}'.format(name, error))
+            continue
+        results[name] = result
+        print('{:<18}{fps:>10.0f}{ms_per_frame:>12.3f}{worst_ms:>12.3f}{alloc_bytes_per_frame:>16.0f}'.format(
+            name, **result))
+    pygame.quit()
+
+    if args.save_baseline:
+        # Keeps the baseline for scenarios that weren't run this time.
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2)
+        print('Saved baseline to', args.baseline)
+
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            sys.exit('No baseline at {}; run with --save-baseline first.'.format(args.baseline))
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print('REGRESSION', regression)
+        if regressions:
+            sys.exit(1)
+        print('No regressions against', args.baseline)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Pack every image in the images folder into one bundle of raw pixels, for the game to memory-map.
+
+Usage:
+    python build_assets.py                   write images/images.bundle
+    python build_assets.py --output path     write the bundle somewhere else
+
+Run it again after changing an image. Until then the game loads the changed image from its
+file, since its file is newer than the bundle's copy.
+"""
+
+# Reads the command line options
+import argparse
+
+# Lists the images and replaces the old bundle
+import os
+
+# Contains functionality to make game
+import pygame
+
+# Imports the bundle format from the assets.py file
+from assets import (IMAGES_DIR, BUNDLE_PATH, BUNDLE_MAGIC, BUNDLE_VERSION, BUNDLE_FORMAT,
+                    BUNDLE_HEADER, BUNDLE_ENTRY)
+
+
+# Image files packed into the bundle.
+IMAGE_EXTENSIONS = ('.bmp', '.png', '.jpg', '.jpeg', '.gif', '.tga')
+
+# Each image's pixels start on a multiple of this many bytes.
+ALIGNMENT = 64
+
+
+def _align(offset):
+    """Return offset rounded up to the next multiple of ALIGNMENT."""
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def build_bundle(path=BUNDLE_PATH, images_dir=IMAGES_DIR):
+    """Write a bundle of every image in images_dir to path, and return the names packed."""
+    names = sorted(name for name in os.listdir(images_dir) if name.lower().endswith(IMAGE_EXTENSIONS))
+
+    images = []
+    for name in names:
+        source = os.path.join(images_dir, name)
+        image = pygame.image.load(source)
+        images.append((name.encode('utf-8'), image.get_size(), os.stat(source).st_mtime_ns,
+                       pygame.image.tobytes(image, BUNDLE_FORMAT)))
+
+    # Works out where each image's pixels go, after the header and index.
+    index_size = BUNDLE_HEADER.size + sum(BUNDLE_ENTRY.size + len(name) for name, _, _, _ in images)
+    offsets = []
+    offset = _align(index_size)
+    for _, _, _, pixels in images:
+        offsets.append(offset)
+        offset = _align(offset + len(pixels))
+
+    # Writes to a temporary file first, so a game mapping the old bundle never sees half a file.
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(BUNDLE_HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, len(images)))
+        for (name, (width, height), mtime, _), offset in zip(images, offsets):
+            f.write(BUNDLE_ENTRY.pack(len(name), width, height, mtime, offset))
+            f.write(name)
+        for (_, _, _, pixels), offset in zip(images, offsets):
+            f.write(b'\0' * (offset - f.tell()))
+            f.write(pixels)
+    os.replace(temp_path, path)
+    return names
+
+
+def main():
+    """Build the bundle and say what went into it."""
+    parser = argparse.ArgumentParser(description='Pack the Alien Invasion images into one memory-mappable bundle.')
+    parser.add_argument('--output', default=BUNDLE_PATH, help='bundle file to write')
+    args = parser.parse_args()
+
+    names = build_bundle(args.output)
+    print('Packed {} images into {} ({:,} bytes): {}'.format(
+        len(names), args.output, os.path.getsize(args.output), ', '.join(names)))
+
+
+if __name__ == '__main__':
+    main()
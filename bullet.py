@@ -5,10 +5,38 @@ import pygame
 from pygame.sprite import Sprite
 
 
+# Bullet images already made, keyed by size and color, so every bullet shares one.
+_images = {}
+
+
+def bullet_image(settings):
+    """Return the shared Surface every bullet is drawn with, a solid block of the bullet color."""
+    key = (settings.bullet_width, settings.bullet_height, tuple(settings.bullet_color))
+    image = _images.get(key)
+    if image is None:
+        # Made in the display's format when there is one, so blitting it is a plain copy.
+        image = pygame.Surface(key[:2])
+        image.fill(settings.bullet_color)
+        _images[key] = image
+    return image
+
+
+def bullet_blits(bullets, alpha=1.0):
+    """Return the (image, rect) pairs that draw bullets, alpha of the way from their last positions."""
+    if alpha < 1.0:
+        return [bullet.blit_item(alpha) for bullet in bullets]
+    # Without blending, each bullet is drawn at its own rect, from the pair it keeps for this.
+    return [bullet.blit_args for bullet in bullets]
+
+
 # Creates a class for Bullet, that is a child-class of Sprite (Sprite in paraenthesis indicates Buttle is a child class of sprite)
 class Bullet(Sprite):
     """A class to manage bullets fired from the ship"""
     
+    # Slots only keep these attributes out of the instance dictionary. Sprite itself has no
+    # __slots__, so every bullet still has one, holding the groups it belongs to.
+    __slots__ = ('screen', 'settings', 'ship', 'color', 'image', 'rect', 'blit_args', 'y', 'previous_y')
+    
     
     # This instance needs the current instance of AlienInvasion, ie using ai_game in the init. 
     def __init__(self, ai_game):
@@ -20,29 +48,48 @@ class Bullet(Sprite):
         self.screen = ai_game.screen
         # Connects bullet settings with the Alien Invasion game settings
         self.settings = ai_game.settings
+        # Fires from the game's ship
+        self.ship = ai_game.ship
         # Connects bullet color with the settings.py file
         self.color = self.settings.bullet_color
+        # Bullets are drawn by blitting a shared block of that color, so many can be drawn in one batch
+        self.image = bullet_image(self.settings)
         
         # Create a bullet rect at (0, 0) and then set correct position
         self.rect = pygame.Rect(0, 0, self.settings.bullet_width, self.settings.bullet_height)
+        # The rect moves in place, so one (image, rect) pair draws the bullet wherever it is.
+        self.blit_args = (self.image, self.rect)
+        self.reset()
+        
+        
+    def reset(self):
+        """Move the bullet back to the ship, ready to be fired again"""
+        
         # Sets the bullet's midtop attribute to match the ship's midtop attribute
-        self.rect.midtop = ai_game.ship.rect.midtop
+        self.rect.midtop = self.ship.rect.midtop
         
         # Store the bullet's position as a decimal value, allows fine adjustment to bullet speed
         self.y = float(self.rect.y)
+        # Where the bullet was on the previous tick, for drawing in between ticks.
+        self.previous_y = self.y
         
         
-    def update(self):
-        """Move the bullet up the screen"""
+    def update(self, dt=1.0):
+        """Move the bullet up the screen, for a tick dt long"""
         
         # Update the decimal position of the bullet
-        self.y -= self.settings.bullet_speed
+        self.previous_y = self.y
+        self.y -= self.settings.bullet_speed * dt
         # Update the rect position
         self.rect.y = self.y
         
     
-    def draw_bullet(self):
-        """Draw the bullet to the screen"""
+    def blit_item(self, alpha=1.0):
+        """Return the image and rect that draw the bullet alpha of the way from its last position"""
         
-        # Fills the part of the screen defined by the bullet's rect with the color stored in self.color
-        pygame.draw.rect(self.screen, self.color, self.rect)
\ No newline at end of file
+        rect = self.rect
+        # Blends the last two positions, so movement looks smooth between ticks.
+        if alpha < 1.0:
+            rect = rect.copy()
+            rect.y = self.previous_y + (self.y - self.previous_y) * alpha
+        return self.image, rect
@@ -1,5 +1,7 @@
 import pygame.font
 
+from text_renderer import get_font
+
 class Button:
     
     def __init__(self, ai_game, msg):
@@ -11,7 +13,8 @@ class Button:
         self.width, self.height = 200, 50
         self.button_color = (0, 255, 0)
         self.text_color = (255, 255, 255)
-        self.font = pygame.font.SysFont(None, 48)
+        # Shares the HUD's font instead of creating another one.
+        self.font = get_font(48)
         
         # Build the button's rect object and center it.
         self.rect = pygame.Rect(0, 0, self.width, self.height)
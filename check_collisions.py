@@ -0,0 +1,181 @@
+"""Check that both fleet backends kill exactly the aliens pygame's groupcollide() would.
+
+Plays the same seeded games three ways: on a reference fleet that tests every bullet against
+every alien with groupcollide(), and on the sprite and NumPy fleets with their column index.
+It compares the whole game state after every tick, and exits with an error at the first tick
+where they differ.
+
+It also plays a short game on a screen too short for a single row of aliens, where every
+wave is empty, on both backends, and checks that drawing the fleet from its cached Surface gives
+the same pixels as drawing each alien, every tick of a long game.
+
+Usage:
+    python check_collisions.py                   the default seeds, bullet limits and game length
+    python check_collisions.py --ticks 20000     play longer games
+    python check_collisions.py --draw-ticks 0    skip drawing the fleet
+"""
+
+# Reads the command line options
+import argparse
+
+# Picks the SDL video driver
+import os
+
+# Exits with an error code when a backend differs from the reference
+import sys
+
+# The check never opens a window.
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+# Contains functionality to make game
+import pygame
+
+# Compares drawn frames in place, without copying their pixels
+import numpy as np
+
+# Imports the settings, the headless simulation and the seeded player
+from settings import Settings
+from simulation import Simulation
+from policies import RandomPlayer
+
+# Imports the sprite fleet the reference is built on
+from fleet import SpriteFleet
+
+
+class GroupcollideFleet(SpriteFleet):
+    """The sprite fleet, with bullets tested against every alien by groupcollide() instead of the column index."""
+
+    def collide_bullets(self, bullets):
+        """Remove bullets and aliens that have collided, and return how many aliens were hit."""
+        collisions = pygame.sprite.groupcollide(bullets, self.aliens, True, True)
+        killed = sum(len(aliens) for aliens in collisions.values())
+        if killed:
+            self._update_bounds()
+        return killed
+
+
+def make_sim(backend, bullets_allowed):
+    """Return a headless game on the named fleet backend, or on the groupcollide() reference."""
+    settings = Settings()
+    settings.bullets_allowed = bullets_allowed
+    settings.scores_path = None
+    if backend == 'reference':
+        # The reference never draws, and doesn't keep the cached fleet up to date.
+        settings.cached_fleet_rendering = False
+        sim = Simulation(settings, create_fleet=False)
+        sim.fleet = GroupcollideFleet(sim)
+    else:
+        settings.fleet_backend = backend
+        sim = Simulation(settings, create_fleet=False)
+    return sim
+
+
+def game_state(sim):
+    """Return everything about sim's game that a collision can change."""
+    fleet = sim.fleet
+    if isinstance(fleet, SpriteFleet):
+        aliens = sorted((alien.rect.x, alien.rect.y) for alien in fleet.aliens.sprites())
+    else:
+        aliens = sorted(zip(fleet.left[fleet.alive].tolist(), fleet.top[fleet.alive].tolist()))
+    bullets = [(bullet.rect.x, bullet.rect.y) for bullet in sim.bullets.sprites()]
+    stats = sim.stats
+    return (stats.score, stats.level, stats.ships_left, stats.state, sim.events, aliens, bullets)
+
+
+def check_game(seed, bullets_allowed, ticks):
+    """Play one seeded game on the reference and both backends, and return the first tick they differ at, or None."""
+    sims = {backend: make_sim(backend, bullets_allowed) for backend in ('reference', 'sprites', 'numpy')}
+    players = {backend: RandomPlayer(seed, keep_playing=True) for backend in sims}
+    for tick in range(ticks):
+        states = {}
+        for backend, sim in sims.items():
+            sim.step(players[backend](sim))
+            states[backend] = game_state(sim)
+        if not states['reference'] == states['sprites'] == states['numpy']:
+            return tick
+    return None
+
+
+def check_empty_fleet(ticks):
+    """Play a game on both backends on a screen too short for any aliens, and return the backend that failed, or None."""
+    for backend in ('sprites', 'numpy'):
+        settings = Settings()
+        settings.screen_height = 220
+        settings.scores_path = None
+        settings.fleet_backend = backend
+        sim = Simulation(settings)
+        sim.prepare_next_fleet()
+        player = RandomPlayer(1, keep_playing=True)
+        try:
+            for tick in range(ticks):
+                sim.step(player(sim))
+        except Exception as error:
+            print('{} fleet, no aliens: fails at tick {}: {!r}'.format(backend, tick, error))
+            return backend
+    return None
+
+
+def fleet_pixels(sim, screen):
+    """Return a view of the pixels of sim's fleet drawn on its own onto screen, over the background."""
+    screen.fill(sim.settings.bg_color)
+    sim.fleet.draw(screen)
+    return pygame.surfarray.pixels2d(screen)
+
+
+def check_cached_drawing(seed, ticks):
+    """Play one seeded game with and without the cached fleet on both backends, and return the first (backend, tick) drawn differently, or None."""
+    for backend in ('sprites', 'numpy'):
+        sims = []
+        for cached in (True, False):
+            settings = Settings()
+            settings.scores_path = None
+            settings.fleet_backend = backend
+            settings.cached_fleet_rendering = cached
+            sims.append(Simulation(settings))
+        players = [RandomPlayer(seed, keep_playing=True) for sim in sims]
+        screens = [pygame.Surface(sim.screen.get_size()) for sim in sims]
+        for tick in range(ticks):
+            for sim, player in zip(sims, players):
+                sim.step(player(sim))
+            if not np.array_equal(fleet_pixels(sims[0], screens[0]), fleet_pixels(sims[1], screens[1])):
+                return backend, tick
+    return None
+
+
+def main():
+    """Check every combination of seed and bullet limit, and exit with an error if any game differs."""
+    parser = argparse.ArgumentParser(description='Check the fleet backends against groupcollide().')
+    parser.add_argument('--seeds', type=int, nargs='+', default=[1, 2, 3], help='seeds of the random players')
+    parser.add_argument('--bullets', type=int, nargs='+', default=[3, 50], help='bullet limits to play with')
+    parser.add_argument('--ticks', type=int, default=5000, help='ticks played in each game')
+    parser.add_argument('--draw-ticks', type=int, default=10000,
+                        help='ticks of the game drawn with and without the cached fleet')
+    args = parser.parse_args()
+
+    failed = False
+    for seed in args.seeds:
+        for bullets_allowed in args.bullets:
+            tick = check_game(seed, bullets_allowed, args.ticks)
+            if tick is None:
+                print('seed {}, {} bullets: identical for {} ticks'.format(seed, bullets_allowed, args.ticks))
+            else:
+                print('seed {}, {} bullets: DIFFERS from groupcollide() at tick {}'.format(seed, bullets_allowed, tick))
+                failed = True
+    differs = check_cached_drawing(args.seeds[0], args.draw_ticks)
+    if differs is None:
+        print('cached fleet: drawn the same as each alien for {} ticks'.format(args.draw_ticks))
+    else:
+        print('{} fleet: cached drawing DIFFERS from each alien at tick {}'.format(*differs))
+        failed = True
+    # Every empty wave counts as cleared, so the game speeds up every tick and is kept short.
+    if check_empty_fleet(100) is None:
+        print('no aliens: both backends play on')
+    else:
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+# Imports the batched bullet blits from the bullet.py file
+from bullet import bullet_blits
+
+
+class DirtyRenderer:
+    """Draw the game by pushing only the parts of the screen that changed to the display."""
+
+    def __init__(self, ai_game):
+        """Get the game objects to draw and start with a full redraw."""
+        self.ai_game = ai_game
+        self.screen = ai_game.screen
+        self.settings = ai_game.settings
+
+        # Rects covered by the ship, bullets and aliens on the last frame.
+        self.previous_rects = []
+
+        # Rects covered by the scoreboard and Play button, and what they showed, on the last frame.
+        self.previous_hud_rects = []
+        self.previous_hud = None
+
+        # The first frame has nothing to compare against, so it redraws everything.
+        self.full_redraw = True
+
+
+    def request_full_redraw(self):
+        """Redraw the whole screen on the next frame, for example after the window is exposed."""
+        self.full_redraw = True
+
+
+    def draw(self, alpha=1.0):
+        """Draw a frame, alpha of the way between ticks, and update only the changed regions of the display."""
+        ai_game = self.ai_game
+        bg_color = self.settings.bg_color
+        hud = self._hud_state()
+        hud_changed = (self.previous_hud is None
+                       or any(new is not old for new, old in zip(hud, self.previous_hud)))
+
+        if self.full_redraw:
+            self.screen.fill(bg_color)
+        else:
+            # Erase everything that moved since the last frame.
+            for rect in self.previous_rects:
+                self.screen.fill(bg_color, rect)
+            if hud_changed:
+                for rect in self.previous_hud_rects:
+                    self.screen.fill(bg_color, rect)
+
+        # Draws the aliens, ship and bullets, remembering where each one went. The fleet goes
+        # first, since the cached fleet covers its gaps with background.
+        rects = ai_game.sim.fleet.draw(self.screen, alpha)
+        queue = ai_game.render_queue
+        queue.add(*ai_game.ship.blit_item(alpha))
+        queue.extend(bullet_blits(ai_game.sim.bullets.sprites(), alpha))
+        sprite_count = len(queue.items)
+
+        # The scoreboard and button are drawn every frame, in case a sprite passed over them.
+        # The scoreboard joins the same batch; only the sprites' rects are kept.
+        queue.extend(ai_game.sb.hud_blits())
+        rects.extend(queue.flush(rects=True)[:sprite_count])
+        hud_rects = self._hud_rects()
+        if not ai_game.stats.game_active:
+            ai_game.play_button.draw_button()
+
+        if self.full_redraw:
+            self.ai_game.presenter.flip()
+            self.full_redraw = False
+        else:
+            dirty = self.previous_rects + rects
+            if hud_changed:
+                dirty += self.previous_hud_rects + hud_rects
+            self.ai_game.presenter.update(dirty)
+
+        self.previous_rects = rects
+        self.previous_hud_rects = hud_rects
+        self.previous_hud = hud
+
+
+    def _hud_state(self):
+        """Return a value that changes whenever the scoreboard or Play button look different."""
+        sb = self.ai_game.sb
+        # Each prep_*() call makes new images, so holding on to them tells us when they changed.
+        return (sb.score_image, sb.high_score_image, sb.level_image, sb.ships,
+                self.ai_game.stats.game_active)
+
+
+    def _hud_rects(self):
+        """Return the rects covered by the scoreboard and Play button."""
+        sb = self.ai_game.sb
+        rects = [sb.score_rect.copy(), sb.high_score_rect.copy(), sb.level_rect.copy()]
+        rects.extend(ship.rect.copy() for ship in sb.ships.sprites())
+        rects.append(self.ai_game.play_button.rect.copy())
+        return rects
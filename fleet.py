@@ -0,0 +1,601 @@
+# Stores the living aliens' positions in flat arrays for snapshots
+from array import array
+
+# Lets a fleet layout be kept as a small, immutable record
+from collections import namedtuple
+
+# Contains functionality to make game
+import pygame
+
+# NumPy is only needed for the array fleet, so the game still runs without it.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Imports the Alien class from the alien.py file
+from alien import Alien
+
+# Imports the shared image loader from the assets.py file
+from assets import load_image
+
+# Imports the column buckets used to find the aliens a bullet could hit
+from spatial_index import ColumnIndex
+
+# Imports the sprite group that reuses its sprites
+from pool import PooledGroup
+
+# Imports the cached whole-fleet Surface
+from fleet_surface import FleetSurface
+
+
+def fleet_slots(settings, alien_size, ship_height):
+    """Return the (x, y) starting position of every alien in a new fleet."""
+    # Spacing between each alien is equal to one alien width.
+    alien_width, alien_height = alien_size
+    # Calculates the horizontal space available for aliens in a row.
+    available_space_x = settings.screen_width - (2 * alien_width)
+    # Calculates the number of aliens that can fit into that row space.
+    number_aliens_x = available_space_x // (2 * alien_width)
+
+    # Calculates available space for rows on screen.
+    available_space_y = (settings.screen_height - (3 * alien_height) - ship_height)
+    # Calcualates number of row that can fit on screen.
+    number_rows = available_space_y // (2 * alien_height)
+
+    # Each alien takes up its own size plus the empty space between it and the last, starting at zero.
+    return [(alien_width + 2 * alien_width * alien_number,
+             alien_height + 2 * alien_height * row_number)
+            for row_number in range(number_rows)
+            for alien_number in range(number_aliens_x)]
+
+
+def make_column_index(alien_width):
+    """Return an empty column index matching the grid laid out by fleet_slots()."""
+    return ColumnIndex(alien_width, 2 * alien_width, alien_width)
+
+
+# A new fleet's starting slots, the slot numbers in each column of the column index, and the
+# slot numbers of the aliens at the full fleet's left, right and bottom extents.
+FleetLayout = namedtuple('FleetLayout', ['slots', 'columns', 'leftmost', 'rightmost', 'lowest'])
+
+# Layouts already worked out, keyed by screen size, alien size and ship height.
+_layouts = {}
+
+
+def fleet_layout(settings, alien_size, ship_height):
+    """Return the shared layout of a new fleet, working it out the first time it is asked for."""
+    key = (settings.screen_width, settings.screen_height, tuple(alien_size), ship_height)
+    layout = _layouts.get(key)
+    if layout is None:
+        slots = tuple(fleet_slots(settings, alien_size, ship_height))
+        # Buckets the slots the same way the column index does.
+        index = make_column_index(alien_size[0])
+        columns = []
+        for number, (x, y) in enumerate(slots):
+            column = index.column_of(x)
+            while len(columns) <= column:
+                columns.append([])
+            columns[column].append(number)
+
+        numbers = range(len(slots))
+        if slots:
+            layout = FleetLayout(slots, tuple(map(tuple, columns)),
+                                 min(numbers, key=lambda number: slots[number][0]),
+                                 max(numbers, key=lambda number: slots[number][0]),
+                                 max(numbers, key=lambda number: slots[number][1]))
+        else:
+            layout = FleetLayout(slots, (), None, None, None)
+        _layouts[key] = layout
+    return layout
+
+
+def _living_area(cache, left, right, bottom):
+    """Return the part of a fleet cache, in starting-slot coordinates, between the living aliens' extents.
+
+    left and right are the starting x of the leftmost and rightmost living aliens, and bottom the
+    starting y of the lowest.
+    """
+    top = cache.origin[1]
+    return pygame.Rect(left, top, right + cache.width - left, bottom + cache.height - top)
+
+
+def _column_runs(columns):
+    """Group the living columns, given in order as (starting x, shift) pairs, into runs that share a shift.
+
+    Each alien rounds its own position, so columns starting at different x can be a pixel apart.
+    Returns (first starting x, last starting x, shift) for each run of neighbouring columns.
+    """
+    runs = []
+    for x, shift in columns:
+        if runs and runs[-1][2] == shift:
+            runs[-1][1] = x
+        else:
+            runs.append([x, x, shift])
+    return runs
+
+
+def _draw_survivors(cache, slots, living):
+    """Make cache show the fleet laid out in slots, with every alien whose (x, y) starting slot isn't in living erased."""
+    cache.match(slots, set(slots).difference(living))
+
+
+def make_fleet(ai_game):
+    """Return the fleet backend chosen in the settings."""
+    if ai_game.settings.fleet_backend == 'numpy':
+        return ArrayFleet(ai_game)
+    return SpriteFleet(ai_game)
+
+
+class SpriteFleet:
+    """A fleet made of one Alien sprite per alien, kept in a pygame Group."""
+
+    def __init__(self, ai_game):
+        """Create an empty fleet for the game."""
+        self.ai_game = ai_game
+        self.screen = ai_game.screen
+        self.settings = ai_game.settings
+
+        # Right edge of the screen, measured once instead of on every check.
+        self.screen_right = self.screen.get_rect().right
+
+        # The fleet on screen: its aliens, which are kept and reused when they die or are cleared
+        # away, the aliens bucketed by column so bullets only test the aliens above them, and the
+        # whole fleet pre-drawn onto one Surface, if turned on in settings.py.
+        self.aliens, self.index, self.cache = self._make_parts()
+
+        # The aliens furthest left, right and down. The fleet moves in lockstep, so these
+        # stay its extents until one of them dies.
+        self.leftmost = None
+        self.rightmost = None
+        self.lowest = None
+
+        # The next fleet, built ahead of time by prepare() so create() only has to swap it in,
+        # and the parts of the fleet swapped out last, which prepare() clears and reuses.
+        self.next_fleet = None
+        self.spare = self._make_parts()
+
+        # How far the fleet moved sideways on its last tick, for drawing in between ticks.
+        self.last_shift = 0.0
+
+        # How far the fleet has dropped since it was created.
+        self.offset_y = 0
+
+
+    def __len__(self):
+        """Return the number of aliens still alive."""
+        return len(self.aliens)
+
+
+    def _make_parts(self):
+        """Return an empty alien group, column index and cache for one fleet."""
+        image = load_image('alien.bmp')
+        cache = FleetSurface(image, self.settings.bg_color) if self.settings.cached_fleet_rendering else None
+        return PooledGroup(lambda: Alien(self.ai_game)), make_column_index(image.get_width()), cache
+
+
+    def prepare(self):
+        """Build the next fleet out of sight, unless it is already built, so create() can swap it in at once."""
+        if self.next_fleet is not None:
+            return
+        group, index, cache = self.spare
+        # Clears away whatever was left of the fleet these parts last held.
+        group.empty()
+
+        # Every alien shares one image, so it gives the size of every alien.
+        alien_size = load_image('alien.bmp').get_size()
+        layout = fleet_layout(self.settings, alien_size, self.ai_game.ship.rect.height)
+
+        # Reuses aliens from earlier fleets, places them, and adds them to the group all at once.
+        aliens = group.acquire_many(len(layout.slots))
+        for alien, (x, y) in zip(aliens, layout.slots):
+            alien.place(x, y)
+        group.add_many(aliens)
+
+        # Buckets the new fleet by column, using the layout's columns.
+        index.fill([[aliens[number] for number in column] for column in layout.columns])
+        if cache:
+            cache.build(layout.slots, self.cache)
+
+        # A full fleet's extents come straight from the layout.
+        extents = (None, None, None)
+        if aliens:
+            extents = (aliens[layout.leftmost], aliens[layout.rightmost], aliens[layout.lowest])
+        self.next_fleet = (group, index, cache, extents)
+
+
+    def create(self):
+        """ Create the fleet of aliens, replacing any still on screen"""
+        # The fleet is normally built ahead by prepare(); if there wasn't time, it is built now.
+        self.prepare()
+        group, index, cache, (self.leftmost, self.rightmost, self.lowest) = self.next_fleet
+        # Only swaps the new fleet in. The old one is cleared away by the next prepare().
+        self.spare = (self.aliens, self.index, self.cache)
+        self.aliens, self.index, self.cache = group, index, cache
+        self.next_fleet = None
+        self.offset_y = 0
+        # A new fleet hasn't moved yet.
+        self.last_shift = 0.0
+
+
+    def _update_bounds(self):
+        """Find the aliens at the fleet's left, right and bottom extents."""
+        aliens = self.aliens.sprites()
+        if not aliens:
+            self.leftmost = self.rightmost = self.lowest = None
+            return
+        self.leftmost = min(aliens, key=lambda alien: alien.rect.left)
+        self.rightmost = max(aliens, key=lambda alien: alien.rect.right)
+        self.lowest = max(aliens, key=lambda alien: alien.rect.bottom)
+
+
+    def empty(self):
+        """Remove every alien from the fleet."""
+        self.aliens.empty()
+        self._update_bounds()
+        self.index.clear()
+
+
+    def alien_state(self):
+        """Return the living aliens as flat arrays, for a snapshot.
+
+        The first array holds four ints per alien: its starting slot's x and y, and its rect's
+        x and y. The second holds each alien's exact horizontal position.
+        """
+        positions = array('i')
+        xs = array('d')
+        offset_y = self.offset_y
+        for alien in self.aliens.sprites():
+            rect = alien.rect
+            positions.extend((alien.start_x, rect.y - offset_y, rect.x, rect.y))
+            xs.append(alien.x)
+        return positions, xs
+
+
+    def restore(self, positions, xs, offset_y, last_shift, index_offset):
+        """Replace the fleet with the living aliens in arrays from alien_state(), and the fleet's own offsets."""
+        self.aliens.empty()
+        aliens = self.aliens.acquire_many(len(xs))
+        for number, alien in enumerate(aliens):
+            start = number * 4
+            alien.place(positions[start], positions[start + 1])
+            alien.x = xs[number]
+            alien.rect.x = positions[start + 2]
+            alien.rect.y = positions[start + 3]
+        self.aliens.add_many(aliens)
+
+        self.offset_y = offset_y
+        self.last_shift = last_shift
+        self.index.build([(alien.start_x, alien) for alien in aliens])
+        self.index.offset_x = index_offset
+        self._update_bounds()
+        if self.cache:
+            layout = fleet_layout(self.settings, load_image('alien.bmp').get_size(), self.ai_game.ship.rect.height)
+            _draw_survivors(self.cache, layout.slots, zip(positions[0::4], positions[1::4]))
+
+
+    def at_edge(self):
+        """Return True if any alien has reached an edge of the screen."""
+        if self.leftmost is None:
+            return False
+        # Only the aliens at the fleet's extents can be the first to reach an edge.
+        return self.leftmost.rect.left <= 0 or self.rightmost.rect.right >= self.screen_right
+
+
+    def drop(self, distance):
+        """Move every alien down the screen by distance."""
+        for alien in self.aliens.sprites():
+            alien.rect.y += distance
+        self.offset_y += distance
+
+
+    def update(self, dt=1.0):
+        """Move every alien by one tick, dt long, in the fleet's direction."""
+        self.aliens.update(dt)
+        self.last_shift = self.settings.alien_speed * self.settings.fleet_direction * dt
+        self.index.shift(self.last_shift)
+
+
+    def collides_with(self, sprite):
+        """Return True if any alien is touching sprite."""
+        return pygame.sprite.spritecollideany(sprite, self.aliens) is not None
+
+
+    def reached_bottom(self, bottom):
+        """Return True if any alien has reached the bottom value."""
+        if self.lowest is None:
+            return False
+        # Alien reaches the bottom when its value is greater than or equal to the screen value.
+        return self.lowest.rect.bottom >= bottom
+
+
+    def collide_bullets(self, bullets):
+        """Remove bullets and aliens that have collided, and return how many aliens were hit."""
+        killed = 0
+        # Bullets are checked in the same order as groupcollide, so an alien can only be hit once.
+        for bullet in bullets.sprites():
+            rect = bullet.rect
+            candidates = self.index.candidates(rect.left, rect.right)
+            hits = [alien for alien in candidates if rect.colliderect(alien.rect)]
+            if hits:
+                for alien in hits:
+                    alien.kill()
+                    self.index.remove(alien.start_x, alien)
+                    if self.cache:
+                        self.cache.erase(alien.start_x, alien.rect.y - self.offset_y)
+                bullet.kill()
+                killed += len(hits)
+        if killed:
+            # Only a death can change the fleet's extents.
+            self._update_bounds()
+        return killed
+
+
+    def draw(self, screen, alpha=1.0):
+        """Draw every alien onto screen, alpha of the way through the last tick's move, and return the drawn rects."""
+        # The whole fleet moves together, so one offset places every alien between ticks.
+        offset = int((alpha - 1.0) * self.last_shift)
+        if self.cache:
+            if self.leftmost is None:
+                return []
+            # Every alien in a column has moved exactly as far, so any one of them gives the column's shift.
+            columns = []
+            for column in self.index.columns:
+                if column:
+                    alien = next(iter(column))
+                    columns.append((alien.start_x, alien.rect.x - alien.start_x))
+            # Only the part of the cache between the living extents is blitted, one blit per run of
+            # columns at the same shift, so each alien is drawn exactly where its rect is.
+            bottom = self.lowest.rect.y - self.offset_y
+            return [self.cache.draw(screen, (shift + offset, self.offset_y), _living_area(self.cache, left, right, bottom))
+                    for left, right, shift in _column_runs(columns)]
+        aliens = self.aliens.sprites()
+        if offset:
+            return screen.blits([(alien.image, alien.rect.move(offset, 0)) for alien in aliens])
+        return screen.blits([(alien.image, alien.rect) for alien in aliens])
+
+
+class ArrayFleet:
+    """A fleet stored as NumPy arrays of positions and alive flags instead of sprites."""
+
+    def __init__(self, ai_game):
+        """Create an empty fleet for the game."""
+        if np is None:
+            raise ImportError("The 'numpy' fleet backend needs NumPy to be installed.")
+
+        self.ai_game = ai_game
+        self.screen = ai_game.screen
+        self.settings = ai_game.settings
+
+        # Every alien shares one image, so only its size is needed for the game rules.
+        self.image = load_image('alien.bmp')
+        self.width, self.height = self.image.get_size()
+        self.screen_width = self.screen.get_width()
+
+        # Exact horizontal position, on-screen left edge, top edge and alive flag of every alien.
+        self.x = np.zeros(0)
+        self.left = np.zeros(0, dtype=np.int64)
+        self.top = np.zeros(0, dtype=np.int64)
+        self.alive = np.zeros(0, dtype=bool)
+        self.count = 0
+
+        # Aliens bucketed by column, so bullets only test the aliens above them.
+        self.index = make_column_index(self.width)
+        self.start_x = np.zeros(0, dtype=np.int64)
+
+        # How far the fleet moved sideways on its last tick, for drawing in between ticks.
+        self.last_shift = 0.0
+
+        # How far the fleet has dropped since it was created.
+        self.offset_y = 0
+
+        # The whole fleet pre-drawn onto one Surface, if turned on in settings.py.
+        self.cache = self._make_cache()
+
+        # The next fleet, built ahead of time by prepare() so create() only has to swap it in,
+        # and the column index and cache of the fleet swapped out last, which prepare() reuses.
+        self.next_fleet = None
+        self.spare = (make_column_index(self.width), self._make_cache())
+
+        # The layout the fleet was last built from, and its slots as an array.
+        self.layout = None
+        self.slot_positions = None
+
+        # Indexes of the living aliens furthest left, right and down, kept up to date as aliens die.
+        self.leftmost = None
+        self.rightmost = None
+        self.lowest = None
+
+
+    def __len__(self):
+        """Return the number of aliens still alive."""
+        return self.count
+
+
+    def _make_cache(self):
+        """Return an empty cache for one fleet, or None if caching is turned off in settings.py."""
+        if self.settings.cached_fleet_rendering:
+            return FleetSurface(self.image, self.settings.bg_color)
+        return None
+
+
+    def prepare(self):
+        """Build the next fleet's arrays out of sight, unless they are already built, so create() can swap them in at once."""
+        if self.next_fleet is not None:
+            return
+        layout = fleet_layout(self.settings, (self.width, self.height), self.ai_game.ship.rect.height)
+        # The slots only need turning into an array when the layout changes.
+        if layout is not self.layout:
+            self.layout = layout
+            self.slot_positions = np.array(layout.slots, dtype=np.int64).reshape(-1, 2)
+        positions = self.slot_positions
+
+        index, cache = self.spare
+        index.fill(layout.columns)
+        if cache:
+            cache.build(layout.slots, self.cache)
+        self.next_fleet = (positions[:, 0].astype(float), positions[:, 0].copy(), positions[:, 1].copy(),
+                           np.ones(len(positions), dtype=bool), index, cache)
+
+
+    def create(self):
+        """Create the fleet of aliens as one block of arrays, replacing any still on screen."""
+        # The fleet is normally built ahead by prepare(); if there wasn't time, it is built now.
+        self.prepare()
+        self.x, self.left, self.top, self.alive, index, cache = self.next_fleet
+        self.spare = (self.index, self.cache)
+        self.index, self.cache = index, cache
+        self.next_fleet = None
+        self.start_x = self.slot_positions[:, 0]
+        self.count = len(self.alive)
+
+        # A full fleet's extents come straight from the layout.
+        layout = self.layout
+        self.leftmost, self.rightmost, self.lowest = layout.leftmost, layout.rightmost, layout.lowest
+        self.offset_y = 0
+        # A new fleet hasn't moved yet.
+        self.last_shift = 0.0
+
+
+    def _update_bounds(self):
+        """Find the living aliens at the fleet's left, right and bottom extents."""
+        if not self.count:
+            self.leftmost = self.rightmost = self.lowest = None
+            return
+        living = np.flatnonzero(self.alive)
+        self.leftmost = int(living[np.argmin(self.left[living])])
+        self.rightmost = int(living[np.argmax(self.left[living])])
+        self.lowest = int(living[np.argmax(self.top[living])])
+
+
+    def empty(self):
+        """Remove every alien from the fleet."""
+        self.alive[:] = False
+        self.count = 0
+        self._update_bounds()
+        self.index.clear()
+
+
+    def alien_state(self):
+        """Return the living aliens as flat arrays, for a snapshot.
+
+        The first array holds four ints per alien: its starting slot's x and y, and its rect's
+        x and y. The second holds each alien's exact horizontal position.
+        """
+        alive = self.alive
+        top = self.top[alive]
+        positions = np.stack((self.start_x[alive], top - self.offset_y, self.left[alive], top), axis=1)
+        return positions.astype(np.int32).ravel(), self.x[alive]
+
+
+    def restore(self, positions, xs, offset_y, last_shift, index_offset):
+        """Replace the fleet with the living aliens in arrays from alien_state(), and the fleet's own offsets."""
+        # Only the living aliens are kept, each in the order it was saved.
+        positions = np.frombuffer(positions, dtype=np.int32).reshape(-1, 4).astype(np.int64)
+        self.start_x = positions[:, 0]
+        self.left = positions[:, 2]
+        self.top = positions[:, 3]
+        self.x = np.array(xs, dtype=float)
+        self.count = len(positions)
+        self.alive = np.ones(self.count, dtype=bool)
+
+        self.offset_y = offset_y
+        self.last_shift = last_shift
+        self.index.build(zip(self.start_x.tolist(), range(self.count)))
+        self.index.offset_x = index_offset
+        self._update_bounds()
+        if self.cache:
+            layout = fleet_layout(self.settings, (self.width, self.height), self.ai_game.ship.rect.height)
+            _draw_survivors(self.cache, layout.slots, zip(positions[:, 0].tolist(), positions[:, 1].tolist()))
+
+
+    def at_edge(self):
+        """Return True if any alien has reached an edge of the screen."""
+        if self.leftmost is None:
+            return False
+        # Only the aliens at the fleet's extents can be the first to reach an edge.
+        return (self.left[self.leftmost] <= 0
+                or self.left[self.rightmost] + self.width >= self.screen_width)
+
+
+    def drop(self, distance):
+        """Move every alien down the screen by distance."""
+        self.top += distance
+        self.offset_y += distance
+
+
+    def update(self, dt=1.0):
+        """Move every alien by one tick, dt long, in the fleet's direction."""
+        self.last_shift = self.settings.alien_speed * self.settings.fleet_direction * dt
+        self.x += self.last_shift
+        self.index.shift(self.last_shift)
+        # Rect positions round halves away from zero, the same as pygame does for sprites.
+        self.left = (np.sign(self.x) * np.floor(np.abs(self.x) + 0.5)).astype(np.int64)
+
+
+    def _hits(self, rect):
+        """Return a mask of the living aliens overlapping rect."""
+        return (self.alive
+                & (self.left < rect.right) & (rect.left < self.left + self.width)
+                & (self.top < rect.bottom) & (rect.top < self.top + self.height))
+
+
+    def collides_with(self, sprite):
+        """Return True if any alien is touching sprite."""
+        return bool(np.any(self._hits(sprite.rect)))
+
+
+    def reached_bottom(self, bottom):
+        """Return True if any alien has reached the bottom value."""
+        if self.lowest is None:
+            return False
+        return self.top[self.lowest] + self.height >= bottom
+
+
+    def collide_bullets(self, bullets):
+        """Remove bullets and aliens that have collided, and return how many aliens were hit."""
+        killed = 0
+        # Bullets are checked in the same order as groupcollide, so an alien can only be hit once.
+        for bullet in bullets.sprites():
+            rect = bullet.rect
+            candidates = self.index.candidates(rect.left, rect.right)
+            if not candidates:
+                continue
+            candidates = np.array(candidates)
+            hits = candidates[(self.left[candidates] < rect.right)
+                              & (rect.left < self.left[candidates] + self.width)
+                              & (self.top[candidates] < rect.bottom)
+                              & (rect.top < self.top[candidates] + self.height)]
+            if len(hits):
+                self.alive[hits] = False
+                for i in hits.tolist():
+                    self.index.remove(self.start_x[i], i)
+                    if self.cache:
+                        self.cache.erase(int(self.start_x[i]), int(self.top[i]) - self.offset_y)
+                bullet.kill()
+                killed += len(hits)
+        if killed:
+            self.count -= killed
+            # Only a death can change the fleet's extents.
+            self._update_bounds()
+        return killed
+
+
+    def draw(self, screen, alpha=1.0):
+        """Draw every alien onto screen, alpha of the way through the last tick's move, and return the drawn rects."""
+        # The whole fleet moves together, so one offset places every alien between ticks.
+        offset = int((alpha - 1.0) * self.last_shift)
+        if self.cache:
+            if self.leftmost is None:
+                return []
+            # Every alien in a column has moved exactly as far, so any one of them gives the column's shift.
+            firsts = [next(iter(column)) for column in self.index.columns if column]
+            start_x = self.start_x[firsts]
+            columns = zip(start_x.tolist(), (self.left[firsts] - start_x).tolist())
+            # Only the part of the cache between the living extents is blitted, one blit per run of
+            # columns at the same shift, so each alien is drawn exactly where its rect is.
+            bottom = int(self.top[self.lowest]) - self.offset_y
+            return [self.cache.draw(screen, (shift + offset, self.offset_y), _living_area(self.cache, left, right, bottom))
+                    for left, right, shift in _column_runs(columns)]
+        positions = zip((self.left[self.alive] + offset).tolist(), self.top[self.alive].tolist())
+        return screen.blits([(self.image, position) for position in positions])
@@ -0,0 +1,105 @@
+# Contains functionality to make game
+import pygame
+
+
+class FleetSurface:
+    """A whole fleet drawn once onto a single Surface, so drawing the fleet takes a blit or two a frame."""
+
+    def __init__(self, image, bg_color):
+        """Create an empty cache for a fleet of aliens that all look like image, on bg_color."""
+        self.image = image
+        self.bg_color = bg_color
+        self.width, self.height = image.get_size()
+
+        # The Surface the fleet is drawn onto, and the screen position of its top left corner
+        # when the fleet is at its starting slots.
+        self.surface = None
+        self.origin = (0, 0)
+
+        # The slots the cache was last built from, an untouched copy of that full fleet, and
+        # the cells erased from the cache since.
+        self.slots = None
+        self.pristine = None
+        self.erased = []
+
+
+    def build(self, slots, source=None):
+        """Draw an alien at each (x, y) starting slot onto the cache.
+
+        source is another cache of the same fleet, whose untouched copy is shared instead of
+        drawing the fleet all over again.
+        """
+        # Fleets built from the same layout look the same, so only the erased cells are copied back.
+        # An empty layout has no cache to copy into.
+        if slots is self.slots and self.surface is not None:
+            pristine = self.pristine
+            self.surface.blits([(pristine, cell, cell) for cell in self.erased], doreturn=False)
+            self.erased.clear()
+            return
+        self.slots = slots
+        self.erased.clear()
+        if not slots:
+            self.surface = self.pristine = None
+            return
+        if source is not None and source.slots is slots:
+            self.origin = source.origin
+            self.pristine = source.pristine
+            self.surface = source.pristine.copy()
+            return
+
+        left = min(x for x, y in slots)
+        top = min(y for x, y in slots)
+        size = (max(x for x, y in slots) + self.width - left, max(y for x, y in slots) + self.height - top)
+        # The gaps are filled with the background, so the cache is opaque. Opaque blits are the
+        # fastest kind, and erasing a cell doesn't make the blit re-encode the whole Surface, the
+        # way it would with an RLE colorkey.
+        # Made in the display's format (pygame's default once a display is set), whatever format the image is in.
+        self.surface = pygame.Surface(size)
+        self.surface.fill(self.bg_color)
+        self.surface.blits([(self.image, (x - left, y - top)) for x, y in slots], doreturn=False)
+        self.origin = (left, top)
+        self.pristine = self.surface.copy()
+
+
+    def erase(self, x, y):
+        """Clear the cell of the alien that started at slot (x, y), without redrawing the rest."""
+        if self.surface is not None:
+            cell = pygame.Rect(x - self.origin[0], y - self.origin[1], self.width, self.height)
+            self.surface.fill(self.bg_color, cell)
+            self.erased.append(cell)
+
+
+    def match(self, slots, missing):
+        """Make the cache show the fleet in slots with only the aliens at the (x, y) starting slots in missing erased.
+
+        Only the cells that differ from what the cache shows now are redrawn.
+        """
+        if slots is not self.slots:
+            self.build(slots)
+        if self.surface is None:
+            return
+        left, top = self.origin
+        wanted = {(x - left, y - top) for x, y in missing}
+        shown = {(cell.x, cell.y) for cell in self.erased}
+        # Copies back the cells of aliens that are meant to be there, and erases the ones that aren't.
+        pristine = self.pristine
+        self.surface.blits([(pristine, cell, cell) for cell in self.erased if (cell.x, cell.y) not in wanted],
+                           doreturn=False)
+        self.erased = [cell for cell in self.erased if (cell.x, cell.y) in wanted]
+        for x, y in wanted - shown:
+            self.erase(x + left, y + top)
+
+
+    def draw(self, screen, offset, area=None):
+        """Blit the fleet onto screen moved offset from its starting slots, and return the drawn rect.
+
+        area, in starting-slot coordinates, limits the blit to the part of the fleet still alive.
+        The cache covers everything under it, so the fleet is drawn before the ship and bullets.
+        """
+        if self.surface is None:
+            return None
+        left, top = self.origin
+        if area is None:
+            return screen.blit(self.surface, (left + offset[0], top + offset[1]))
+        source = pygame.Rect(area).move(-left, -top)
+        return screen.blit(self.surface, (area[0] + offset[0], area[1] + offset[1]), source)
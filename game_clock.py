@@ -0,0 +1,46 @@
+# Contains functionality to make game
+import pygame
+
+
+class FrameClock:
+    """Limit the frame rate and decide how many fixed simulation ticks each frame should run."""
+
+    # Longest gap between frames that is caught up on, so a stall can't snowball into more stalls.
+    max_frame_time = 0.25
+
+    def __init__(self, settings):
+        """Set up the clock from the timing settings."""
+        self.settings = settings
+        self.clock = pygame.time.Clock()
+
+        # Length of one simulation tick, in seconds.
+        self.tick_length = 1.0 / settings.tick_rate
+
+        # Time that has passed but not yet been simulated.
+        self.accumulator = 0.0
+
+
+    def tick(self):
+        """Wait for the next frame, then add the time since the last one to the accumulator."""
+        # Clock.tick() sleeps instead of spinning, so a capped game leaves the CPU idle.
+        elapsed = self.clock.tick(self.settings.frame_rate) / 1000.0
+        self.accumulator += min(elapsed, self.max_frame_time)
+
+
+    def consume_tick(self):
+        """Return True, and use up one tick of time, if a whole tick is waiting to be simulated."""
+        if self.accumulator >= self.tick_length:
+            self.accumulator -= self.tick_length
+            return True
+        return False
+
+
+    @property
+    def alpha(self):
+        """Return how far, from 0 to 1, the current frame is between the last tick and the next."""
+        return self.accumulator / self.tick_length
+
+
+    def get_fps(self):
+        """Return the average frame rate over the last few frames."""
+        return self.clock.get_fps()
@@ -1,3 +1,14 @@
+# The states a game can be in.
+# No game is running: before the first game, and after the last ship is lost.
+STATE_GAME_OVER = 'game_over'
+# The player is in control and everything moves.
+STATE_PLAYING = 'playing'
+# Short pause after the ship is hit, before the new fleet starts moving.
+STATE_RESPAWN = 'respawn'
+# Short pause after a fleet is cleared, before the next level starts moving.
+STATE_LEVEL_TRANSITION = 'level_transition'
+
+
 class GameStats:
     """Track statistics for Alien Invasion"""
     
@@ -8,7 +19,9 @@ class GameStats:
         self.reset_stats()
         
         # Start Alien Invasion in an inactive state.
-        self.game_active = False
+        self.state = STATE_GAME_OVER
+        # Ticks left before a pause ends.
+        self.state_ticks = 0
         
         # High score should not be reset. 
         self.high_score = 0
@@ -18,4 +31,39 @@ class GameStats:
         """Initialize statistics that can change during the game."""
         self.ships_left = self.settings.ship_limit
         self.score = 0 
-        self.level = 1
\ No newline at end of file
+        self.level = 1
+        
+        
+    @property
+    def game_active(self):
+        """Return True while a game is running, including its short pauses."""
+        return self.state != STATE_GAME_OVER
+    
+    
+    @game_active.setter
+    def game_active(self, active):
+        """Start playing, or end the game."""
+        self.state = STATE_PLAYING if active else STATE_GAME_OVER
+        self.state_ticks = 0
+        
+        
+    @property
+    def paused(self):
+        """Return True during the pause after a ship hit or a cleared level."""
+        return self.state in (STATE_RESPAWN, STATE_LEVEL_TRANSITION)
+    
+    
+    def start_pause(self, state, ticks):
+        """Pause play in state for the given number of ticks."""
+        # A pause with no length goes straight back to playing.
+        if ticks > 0:
+            self.state = state
+            self.state_ticks = ticks
+            
+            
+    def update_pause(self):
+        """Count down one tick of the current pause, and go back to playing when it runs out."""
+        self.state_ticks -= 1
+        if self.state_ticks <= 0:
+            self.state = STATE_PLAYING
+            self.state_ticks = 0
@@ -0,0 +1,137 @@
+# Reads and writes the saved scores
+import json
+
+# Finds the save file's folder, and replaces the old file with the new one
+import os
+
+# Reads the old file's permissions, to give them to the new one
+import stat
+
+# Writes the new file next to the old one before swapping it in
+import tempfile
+
+# Writes in the background, so the game never waits on the disk
+import threading
+
+# Stamps each session with when it ended
+import time
+
+
+# Permissions a new scores file gets: readable by everyone and writable by its owner, less
+# anything the umask takes away. The umask can only be read by setting it, which changes it for
+# the whole process, so it is read once, when the game imports this module, before any threads start.
+_umask = os.umask(0)
+os.umask(_umask)
+NEW_FILE_MODE = 0o644 & ~_umask
+
+
+class ScoreStore:
+    """Keep the high score and finished sessions in a file, written by a background thread.
+
+    The game only hands new values over, which takes a lock for a moment. The writer thread
+    coalesces everything handed over since its last write into one write, swaps the new file
+    in atomically, and writes at most once every min_interval seconds.
+    """
+
+    # Most recent sessions kept in the file.
+    max_sessions = 100
+
+    def __init__(self, path, min_interval=5.0):
+        """Load what was saved at path, and start the writer thread."""
+        self.path = path
+        self.min_interval = min_interval
+
+        saved = self._load()
+        self.high_score = saved.get('high_score', 0)
+        self.sessions = saved.get('sessions', [])[-self.max_sessions:]
+
+        # The last error the writer hit, kept for reporting instead of stopping the game.
+        self.last_error = None
+
+        # Set when there is something the file doesn't have yet, or when the store is closing.
+        self._condition = threading.Condition()
+        self._dirty = False
+        self._closing = False
+        self._thread = threading.Thread(target=self._run, name='ScoreStore', daemon=True)
+        self._thread.start()
+
+
+    def submit_high_score(self, score):
+        """Hand over a new high score to be saved."""
+        with self._condition:
+            if score > self.high_score:
+                self.high_score = score
+                self._dirty = True
+                self._condition.notify()
+
+
+    def record_session(self, score, level):
+        """Hand over the result of a finished game to be saved."""
+        with self._condition:
+            self.sessions.append({'score': score, 'level': level, 'ended': time.time()})
+            del self.sessions[:-self.max_sessions]
+            self._dirty = True
+            self._condition.notify()
+
+
+    def close(self, timeout=2.0):
+        """Write anything not yet saved and stop the writer thread."""
+        with self._condition:
+            self._closing = True
+            self._condition.notify()
+        self._thread.join(timeout)
+
+
+    def _load(self):
+        """Return what was saved in the file, or nothing if it is missing or unreadable."""
+        try:
+            with open(self.path) as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return saved if isinstance(saved, dict) else {}
+
+
+    def _run(self):
+        """Write the file whenever there is something new, at most once every min_interval seconds."""
+        while True:
+            with self._condition:
+                while not self._dirty and not self._closing:
+                    self._condition.wait()
+                if not self._dirty:
+                    return
+                # Copies what is to be written, so the file is written without holding the lock.
+                saved = {'high_score': self.high_score, 'sessions': list(self.sessions)}
+                self._dirty = False
+
+            self._write(saved)
+
+            # Waits out the rest of the interval, unless the store is closing.
+            with self._condition:
+                self._condition.wait_for(lambda: self._closing, self.min_interval)
+
+
+    def _write(self, saved):
+        """Write saved to a temporary file and swap it in for the old one."""
+        folder = os.path.dirname(os.path.abspath(self.path))
+        try:
+            # The first save makes the folder the file goes in.
+            os.makedirs(folder, exist_ok=True)
+            with tempfile.NamedTemporaryFile('w', dir=folder, prefix='.scores-', suffix='.tmp', delete=False) as f:
+                json.dump(saved, f)
+                f.flush()
+                os.fsync(f.fileno())
+            # The temporary file is only readable by its owner, so it takes the old file's permissions.
+            try:
+                mode = stat.S_IMODE(os.stat(self.path).st_mode)
+            except OSError:
+                mode = NEW_FILE_MODE
+            os.chmod(f.name, mode)
+            # Readers see either the whole old file or the whole new one, never half of either.
+            os.replace(f.name, self.path)
+        except OSError as error:
+            self.last_error = error
+            try:
+                os.remove(f.name)
+            except (OSError, NameError):
+                pass
@@ -0,0 +1,58 @@
+# Lets the random player make its own repeatable choices
+import random
+
+# Imports the simulation's per-tick input
+from simulation import Inputs
+
+
+class SweepAndFire:
+    """A scripted player that sweeps the ship across the screen while holding fire."""
+
+    def __init__(self, keep_playing=True):
+        """Start off moving right; keep_playing presses Play again whenever a game ends."""
+        self.keep_playing = keep_playing
+        self.moving_right = True
+        self.started = False
+
+
+    def __call__(self, game):
+        """Return this tick's input for game (an AlienInvasion or a Simulation)."""
+        ship_rect = game.ship.rect
+        # Turns around near either edge of the screen.
+        if ship_rect.right >= game.screen.get_rect().right - 10:
+            self.moving_right = False
+        elif ship_rect.left <= 10:
+            self.moving_right = True
+        play = self.keep_playing or not self.started
+        self.started = True
+        return Inputs(left=not self.moving_right, right=self.moving_right, fire=True, play=play)
+
+
+class RandomPlayer:
+    """A player that holds random directions for random lengths of time and fires at random."""
+
+    def __init__(self, seed=None, keep_playing=False, fire_chance=0.2, turn_chance=0.05):
+        """Create a player whose choices are repeatable for the same seed."""
+        self.random = random.Random(seed)
+        self.keep_playing = keep_playing
+        self.fire_chance = fire_chance
+        self.turn_chance = turn_chance
+        self.left = self.right = False
+        self.started = False
+
+
+    def __call__(self, game):
+        """Return this tick's input for game (an AlienInvasion or a Simulation)."""
+        choose = self.random.random
+        if choose() < self.turn_chance:
+            self.left, self.right = choose() < 0.5, choose() < 0.5
+        play = self.keep_playing or not self.started
+        self.started = True
+        return Inputs(self.left, self.right, choose() < self.fire_chance, play)
+
+
+# Players that can be picked by name from the command line.
+POLICIES = {
+    'sweep': SweepAndFire,
+    'random': RandomPlayer,
+}
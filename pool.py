@@ -0,0 +1,45 @@
+# Imports the Group class from pygame
+from pygame.sprite import Group
+
+
+class PooledGroup(Group):
+    """A sprite Group that keeps the sprites removed from it, so they can be reused instead of reallocated."""
+
+    def __init__(self, factory):
+        """Create an empty group that makes new sprites with factory() when its pool runs out."""
+        super().__init__()
+        self.factory = factory
+
+        # Sprites that have left the group and are free to be reused.
+        self.free = []
+
+
+    def acquire(self):
+        """Return a spare sprite from the pool, or a new one if the pool is empty."""
+        if self.free:
+            return self.free.pop()
+        return self.factory()
+
+
+    def acquire_many(self, count):
+        """Return count sprites, taking spares from the pool first and creating the rest."""
+        free = self.free
+        taken = free[len(free) - min(count, len(free)):]
+        del free[len(free) - len(taken):]
+        taken.extend(self.factory() for _ in range(count - len(taken)))
+        return taken
+
+
+    def add_many(self, sprites):
+        """Add sprites that aren't already in the group, in one pass."""
+        # Skips add()'s per-sprite type and membership checks, which a whole fleet doesn't need.
+        self.spritedict.update(dict.fromkeys(sprites))
+        for sprite in sprites:
+            sprite.add_internal(self)
+
+
+    def remove_internal(self, sprite):
+        """Remove a sprite from the group and keep it for reuse."""
+        # kill(), remove() and empty() all end up here, so every way out of the group refills the pool.
+        super().remove_internal(sprite)
+        self.free.append(sprite)
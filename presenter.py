@@ -0,0 +1,73 @@
+# Contains functionality to make game
+import pygame
+
+
+class Presenter:
+    """Open the window and show what the game draws in it, scaling the game up to fit if turned on in settings.py.
+
+    The game is always drawn onto screen, at screen_width x screen_height, so the size of the window
+    never changes where anything is in the game or how much each frame costs to draw.
+    """
+
+    # Color of the bars around a scaled game whose shape doesn't match the window.
+    border_color = (0, 0, 0)
+
+    def __init__(self, settings):
+        """Open the window chosen in the settings, and make the screen Surface the game draws onto."""
+        self.settings = settings
+        size = (settings.screen_width, settings.screen_height)
+        fullscreen = pygame.FULLSCREEN if settings.fullscreen else 0
+        self.mode = settings.scale_mode
+
+        if self.mode == 'hardware':
+            try:
+                # SDL scales the screen up on the GPU, and waits for vsync instead of tearing.
+                self.window = pygame.display.set_mode(size, pygame.SCALED | fullscreen, vsync=1)
+            except pygame.error:
+                # No renderer can do it here, so the game is scaled with a blit instead.
+                self.mode = 'software'
+            else:
+                self.screen = self.window
+                self.view = self.window.get_rect()
+
+        if self.mode == 'software':
+            window_size = settings.window_size
+            if window_size is None:
+                window_size = pygame.display.get_desktop_sizes()[0] if fullscreen else size
+            self.window = pygame.display.set_mode(window_size, fullscreen)
+            # The game is drawn off screen, then scaled into the largest area of the window with the same shape.
+            self.screen = pygame.Surface(size).convert()
+            scale = min(window_size[0] / size[0], window_size[1] / size[1])
+            self.view = pygame.Rect(0, 0, round(size[0] * scale), round(size[1] * scale))
+            self.view.center = self.window.get_rect().center
+            self.window.fill(self.border_color)
+            self.window_view = self.window.subsurface(self.view)
+        elif self.mode != 'hardware':
+            # Without scaling, the game draws straight onto the window.
+            self.window = self.screen = pygame.display.set_mode(size, fullscreen)
+            self.view = self.window.get_rect()
+
+
+    def flip(self):
+        """Show the whole of the latest frame."""
+        if self.mode == 'software':
+            pygame.transform.scale(self.screen, self.view.size, self.window_view)
+        pygame.display.flip()
+
+
+    def update(self, rects):
+        """Show the parts of the latest frame covered by rects."""
+        # Scaled rects don't line up with the scaled pixels exactly, so a software-scaled frame is shown whole.
+        if self.mode == 'software':
+            self.flip()
+        else:
+            pygame.display.update(rects)
+
+
+    def to_screen(self, position):
+        """Return a window position, such as the mouse's, as a position on the game's screen."""
+        # SDL already maps positions for hardware scaling.
+        if self.mode != 'software':
+            return position
+        return ((position[0] - self.view.x) * self.screen.get_width() // self.view.width,
+                (position[1] - self.view.y) * self.screen.get_height() // self.view.height)
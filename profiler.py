@@ -0,0 +1,183 @@
+# Stores each phase's frame times in compact, fixed-size arrays of floats
+from array import array
+
+# Used to write the exported report
+import csv
+import json
+
+# Used to find percentile ranks
+import math
+
+# High-resolution timer used to time each phase
+import time
+
+# Contains functionality to make game
+import pygame
+
+# Imports the shared font loader from the text_renderer.py file
+from text_renderer import get_font
+
+
+# The phases of a frame, in the order they run.
+PHASES = ('events', 'ship', 'bullets', 'collisions', 'aliens', 'screen')
+
+
+class FrameProfiler:
+    """Time each phase of every frame into a ring buffer, and report on the slowest frames."""
+
+    def __init__(self, ai_game):
+        """Create empty ring buffers sized from the settings."""
+        self.ai_game = ai_game
+        self.screen = ai_game.screen
+        self.settings = ai_game.settings
+        self.size = self.settings.profile_frames
+
+        # Seconds spent in each phase on each of the last few frames, plus the whole frame.
+        self.samples = {phase: array('d', [0.0]) * self.size for phase in PHASES + ('frame',)}
+        # Number of frames recorded so far; the ring wraps around once it passes the buffer size.
+        self.frames = 0
+
+        # Time spent in each phase so far during the current frame.
+        self.current = dict.fromkeys(PHASES, 0.0)
+        # Time spent in timed calls made from inside the call being timed, so phases don't count it twice.
+        self._nested = []
+        self.frame_start = time.perf_counter()
+
+        # On-screen overlay, shown with F3.
+        self.overlay_visible = False
+        self.font = get_font(24)
+        self.text_color = (30, 30, 30)
+        self.overlay_lines = []
+        self.overlay_prepped_at = 0.0
+
+
+    def instrument(self, obj, name, phase):
+        """Replace obj's method name with one that times each call under phase."""
+        method = getattr(obj, name)
+        nested = self._nested
+        current = self.current
+        perf_counter = time.perf_counter
+
+        def timed(*args, **kwargs):
+            nested.append(0.0)
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = perf_counter() - start
+                # Only the time not spent in other timed phases belongs to this one.
+                current[phase] += elapsed - nested.pop()
+                if nested:
+                    nested[-1] += elapsed
+
+        # Set on the instance only, so a game without the profiler runs the untouched methods.
+        setattr(obj, name, timed)
+
+
+    def instrument_game(self, ai_game):
+        """Time the phases of the game's main loop."""
+        sim = ai_game.sim
+        self.instrument(ai_game, '_check_events', 'events')
+        self.instrument(sim.ship, 'update', 'ship')
+        self.instrument(sim, '_update_bullets', 'bullets')
+        self.instrument(sim, '_check_bullet_alien_collisions', 'collisions')
+        self.instrument(sim, '_update_aliens', 'aliens')
+        self.instrument(ai_game, '_update_screen', 'screen')
+
+
+    def end_frame(self):
+        """Store the times for the frame that just finished and start timing the next one."""
+        now = time.perf_counter()
+        slot = self.frames % self.size
+        for phase, seconds in self.current.items():
+            self.samples[phase][slot] = seconds
+            self.current[phase] = 0.0
+        self.samples['frame'][slot] = now - self.frame_start
+        self.frame_start = now
+        self.frames += 1
+
+        # Refreshes the overlay text twice a second, so it is readable and cheap.
+        if self.overlay_visible and now - self.overlay_prepped_at >= 0.5:
+            self._prep_overlay()
+
+
+    def recorded(self, phase):
+        """Return the recorded times for phase, oldest first."""
+        samples = self.samples[phase]
+        if self.frames <= self.size:
+            return list(samples[:self.frames])
+        slot = self.frames % self.size
+        return list(samples[slot:]) + list(samples[:slot])
+
+
+    def stats(self):
+        """Return the p50, p95, p99 and worst time, in milliseconds, for each phase and the whole frame."""
+        report = {}
+        for phase in PHASES + ('frame',):
+            times = sorted(self.recorded(phase))
+            if not times:
+                continue
+            report[phase] = {
+                'p50': _percentile(times, 50) * 1000,
+                'p95': _percentile(times, 95) * 1000,
+                'p99': _percentile(times, 99) * 1000,
+                'worst': times[-1] * 1000,
+            }
+        return report
+
+
+    def toggle_overlay(self):
+        """Show or hide the on-screen overlay."""
+        self.overlay_visible = not self.overlay_visible
+        if self.overlay_visible:
+            self._prep_overlay()
+
+
+    def _prep_overlay(self):
+        """Render the overlay's lines of text from the latest stats."""
+        lines = ['phase       p50   p95   p99  worst ms']
+        for phase, stat in self.stats().items():
+            lines.append('{:<10}{p50:6.2f}{p95:6.2f}{p99:6.2f}{worst:7.2f}'.format(phase, **stat))
+        self.overlay_lines = [self.font.render(line, True, self.text_color, self.settings.bg_color)
+                              for line in lines]
+        self.overlay_prepped_at = time.perf_counter()
+
+
+    def draw_overlay(self, top):
+        """Draw the overlay below top, along the right of the screen, and return the rect it covers."""
+        width = max(image.get_width() for image in self.overlay_lines)
+        height = sum(image.get_height() for image in self.overlay_lines)
+        rect = pygame.Rect(0, top, width, height)
+        rect.right = self.screen.get_rect().right - 20
+        self.screen.fill(self.settings.bg_color, rect)
+        y = rect.top
+        for image in self.overlay_lines:
+            self.screen.blit(image, (rect.left, y))
+            y += image.get_height()
+        return rect
+
+
+    def export(self, path):
+        """Write every recorded frame to path, as CSV or as JSON with summary stats, chosen by its extension."""
+        columns = PHASES + ('frame',)
+        recorded = {phase: self.recorded(phase) for phase in columns}
+        if path.endswith('.csv'):
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(('frame',) + tuple(phase + '_ms' for phase in columns))
+                for frame, row in enumerate(zip(*(recorded[phase] for phase in columns))):
+                    writer.writerow([frame] + ['{:.4f}'.format(seconds * 1000) for seconds in row])
+        else:
+            with open(path, 'w') as f:
+                json.dump({
+                    'frames': len(recorded['frame']),
+                    'stats_ms': self.stats(),
+                    'samples_ms': {phase: [seconds * 1000 for seconds in times]
+                                   for phase, times in recorded.items()},
+                }, f, indent=2)
+
+
+def _percentile(sorted_times, percent):
+    """Return the nearest-rank percentile of an already sorted list."""
+    rank = max(math.ceil(percent / 100 * len(sorted_times)) - 1, 0)
+    return sorted_times[rank]
@@ -0,0 +1,143 @@
+"""Compact recordings of the player's input for every tick.
+
+A recording starts with the settings the game began with (the game has no random
+elements, so the settings are all the state a replay needs), followed by the input
+for every tick packed into 4 bits and run-length encoded. replay.py plays them back.
+"""
+
+# Stores the settings in the recording's header
+import json
+
+# Packs the header's fixed-size fields
+import struct
+
+# Imports the Settings class from the settings.py file
+from settings import Settings
+
+# Imports the simulation's per-tick input
+from simulation import Inputs
+
+
+# First bytes of every recording, followed by the format version.
+MAGIC = b'AIRP'
+VERSION = 1
+
+
+def pack_inputs(inputs):
+    """Return one tick of input packed into the low 4 bits of an int."""
+    return inputs.left | inputs.right << 1 | inputs.fire << 2 | inputs.play << 3
+
+
+def unpack_inputs(value):
+    """Return the Inputs packed into value by pack_inputs()."""
+    return Inputs(bool(value & 1), bool(value & 2), bool(value & 4), bool(value & 8))
+
+
+def _write_varint(out, number):
+    """Append number to out as a little-endian base-128 varint."""
+    while number >= 0x80:
+        out.append(number & 0x7F | 0x80)
+        number >>= 7
+    out.append(number)
+
+
+def _read_varint(data, position):
+    """Return the varint starting at position in data, and the position after it."""
+    number = shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        number |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return number, position
+        shift += 7
+
+
+class InputRecorder:
+    """Collect each tick's input as runs of identical ticks, ready to save as a recording."""
+
+    def __init__(self, settings):
+        """Start an empty recording of a game that begins with these settings."""
+        # Copies the settings now, before the game starts changing its dynamic settings.
+        self.settings = dict(vars(settings))
+        self.runs = bytearray()
+        self.value = None
+        self.count = 0
+        self.ticks = 0
+
+
+    def record(self, inputs):
+        """Add one tick of input to the recording."""
+        value = pack_inputs(inputs)
+        if value == self.value:
+            self.count += 1
+        else:
+            self._flush()
+            self.value = value
+            self.count = 1
+        self.ticks += 1
+
+
+    def _flush(self, runs=None):
+        """Write out the run of identical ticks collected so far."""
+        runs = self.runs if runs is None else runs
+        if self.count:
+            runs.append(self.value)
+            _write_varint(runs, self.count)
+
+
+    def to_bytes(self):
+        """Return the whole recording as bytes."""
+        # The current run is written to a copy, so recording can carry on after saving.
+        runs = bytearray(self.runs)
+        self._flush(runs)
+        header = json.dumps(self.settings).encode()
+        return MAGIC + struct.pack('<BII', VERSION, self.ticks, len(header)) + header + bytes(runs)
+
+
+    def save(self, path):
+        """Write the recording to path."""
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+
+class Recording:
+    """A saved recording: the settings a game began with and the input for each of its ticks."""
+
+    def __init__(self, data):
+        """Read a recording from the bytes made by InputRecorder.to_bytes()."""
+        if data[:4] != MAGIC:
+            raise ValueError('Not an Alien Invasion recording.')
+        version, self.ticks, header_length = struct.unpack_from('<BII', data, 4)
+        if version != VERSION:
+            raise ValueError('Unsupported recording version {}.'.format(version))
+        start = 4 + struct.calcsize('<BII')
+        self.settings_state = json.loads(data[start:start + header_length])
+        self.runs = data[start + header_length:]
+
+
+    @classmethod
+    def load(cls, path):
+        """Read a recording from path."""
+        with open(path, 'rb') as f:
+            return cls(f.read())
+
+
+    def make_settings(self):
+        """Return Settings matching the ones the recorded game began with."""
+        settings = Settings()
+        for name, value in self.settings_state.items():
+            # JSON has no tuples, so colors and other pairs come back as lists.
+            setattr(settings, name, tuple(value) if isinstance(value, list) else value)
+        return settings
+
+
+    def inputs(self):
+        """Yield the input for every recorded tick, in order."""
+        runs = self.runs
+        position = 0
+        while position < len(runs):
+            inputs = unpack_inputs(runs[position])
+            count, position = _read_varint(runs, position + 1)
+            for _ in range(count):
+                yield inputs
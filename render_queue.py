@@ -0,0 +1,43 @@
+class RenderQueue:
+    """Collect a frame's blits as they are asked for, and send them to a Surface in one batch.
+
+    Each blit made from Python costs a call into SDL, so one batched call for the ship, every
+    bullet and the scoreboard costs far less than a call each once there are many bullets.
+    """
+
+    def __init__(self, screen):
+        """Create an empty queue that draws onto screen."""
+        self.screen = screen
+
+        # (image, position) pairs waiting to be drawn, in the order they were queued.
+        self.items = []
+
+        # pygame-ce's fblits() draws a batch without making a rect for each blit; pygame only has blits().
+        self.fblits = getattr(screen, 'fblits', None)
+
+
+    def add(self, image, position):
+        """Queue image to be drawn at position."""
+        self.items.append((image, position))
+
+
+    def extend(self, items):
+        """Queue every (image, position) pair in items, in order."""
+        self.items.extend(items)
+
+
+    def flush(self, rects=False):
+        """Draw everything queued, in order, and empty the queue.
+
+        If rects is True, return the rect each queued item was drawn at, in the same order.
+        """
+        items = self.items
+        drawn = None
+        if rects:
+            drawn = self.screen.blits(items)
+        elif self.fblits is not None:
+            self.fblits(items)
+        else:
+            self.screen.blits(items, doreturn=False)
+        items.clear()
+        return drawn
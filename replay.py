@@ -0,0 +1,81 @@
+"""Replay a recorded session through the game, faster than real time.
+
+Usage:
+    python replay.py session.rec              replay headless, as fast as possible
+    python replay.py session.rec --render     replay with drawing turned on
+    python replay.py session.rec --profile    replay with drawing and the frame profiler on
+    python replay.py session.rec --window     replay in a real window
+"""
+
+# Reads the command line options
+import argparse
+
+# Picks the SDL video driver
+import os
+
+# Times the replay
+import time
+
+# Imports the headless simulation
+from simulation import Simulation
+
+# Imports the interactive game, used when a replay is drawn
+from alien_invasion import AlienInvasion
+
+# Imports the recording format from the recording.py file
+from recording import Recording
+
+
+def replay(recording, render=False, profile=False):
+    """Run a recording through the game as fast as possible, and return the game or simulation used."""
+    settings = recording.make_settings()
+    # A replay is never recorded again, and doesn't change the saved scores.
+    settings.record_path = None
+    settings.scores_path = None
+    settings.telemetry_path = None
+    if not (render or profile):
+        sim = Simulation(settings)
+        for inputs in recording.inputs():
+            sim.step(inputs)
+        return sim
+
+    settings.profile = profile
+    game = AlienInvasion(settings)
+    for inputs in recording.inputs():
+        # Runs the same frame as run_game, one tick per frame and without waiting on the clock.
+        game._check_events()
+        game._handle_sim_events(game.sim.step(inputs))
+        game._update_screen()
+        if game.profiler:
+            game.profiler.end_frame()
+    if game.profiler and settings.profile_export:
+        game.profiler.export(settings.profile_export)
+    return game
+
+
+def main():
+    """Replay the recording named on the command line and report how it went."""
+    parser = argparse.ArgumentParser(description='Replay a recorded Alien Invasion session.')
+    parser.add_argument('recording', help='recording file to replay')
+    parser.add_argument('--render', action='store_true', help='draw every frame')
+    parser.add_argument('--profile', action='store_true', help='draw every frame and run the frame profiler')
+    parser.add_argument('--window', action='store_true', help='show the game in a real window')
+    args = parser.parse_args()
+
+    # Replays draw off screen unless a window is asked for.
+    if not args.window:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+    recording = Recording.load(args.recording)
+    start = time.perf_counter()
+    game = replay(recording, args.render or args.window, args.profile)
+    elapsed = time.perf_counter() - start
+
+    stats = game.stats
+    real_time = recording.ticks / recording.make_settings().tick_rate
+    print('Replayed {} ticks in {:.2f}s ({:.1f}x real time): score {}, level {}, ships left {}'.format(
+        recording.ticks, elapsed, real_time / max(elapsed, 1e-9), stats.score, stats.level, stats.ships_left))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,9 @@
-import pygame.font
-
 from pygame.sprite import Group
 
 from ship import Ship
 
+from text_renderer import get_atlas
+
 
 class Scoreboard:
     """A class to report scoring information"""
@@ -18,7 +18,8 @@ class Scoreboard:
         
         # Font settings for scoring information.
         self.text_color = (30, 30, 30)
-        self.font = pygame.font.SysFont(None, 48)
+        # Digits and commas are rendered once into a shared atlas, then blitted to build each number.
+        self.atlas = get_atlas(48, self.text_color, self.settings.bg_color)
         
         # Prepare the initial score images. 
         self.prep_score()
@@ -32,7 +33,7 @@ class Scoreboard:
         high_score = round(self.stats.high_score, -1)
         # Tells where to place "," in formatted score. 
         high_score_str = "{:,}".format(high_score)
-        self.high_score_image = self.font.render(high_score_str, True, self.text_color, self.settings.bg_color)
+        self.high_score_image = self.atlas.render(high_score_str)
         
         # Center the high score at the top of the screen. 
         self.high_score_rect = self.high_score_image.get_rect()
@@ -45,7 +46,7 @@ class Scoreboard:
         rounded_score = round(self.stats.score, -1)
         # Tells where to place "," in formatted score. 
         score_str = "{:,}".format(rounded_score)
-        self.score_image = self.font.render(score_str, True, self.text_color, self.settings.bg_color)
+        self.score_image = self.atlas.render(score_str)
         
         # Display the score at the top right of the screen.
         self.score_rect = self.score_image.get_rect()
@@ -56,7 +57,7 @@ class Scoreboard:
     def prep_level(self):
         """Turn the level into a rendered image"""
         level_str = str(self.stats.level)
-        self.level_image = self.font.render(level_str, True, self.text_color, self.settings.bg_color)
+        self.level_image = self.atlas.render(level_str)
         
         # Position the level below the score.
         self.level_rect = self.level_image.get_rect()
@@ -72,14 +73,15 @@ class Scoreboard:
             ship.rect.x = 10 + ship_number * ship.rect.width
             ship.rect.y = 10
             self.ships.add(ship)
+        # The ship icons only move when they are prepped again, so their blits are listed once here.
+        self.ship_blits = [(ship.image, ship.rect) for ship in self.ships.sprites()]
         
         
-    def show_score(self):
-        """Draw scores, level, and ships to the screen."""
-        self.screen.blit(self.score_image, self.score_rect)
-        self.screen.blit(self.high_score_image, self.high_score_rect)
-        self.screen.blit(self.level_image, self.level_rect)
-        self.ships.draw(self.screen)
+    def hud_blits(self):
+        """Return the (image, rect) pairs that draw the scores, level, and ships."""
+        return [(self.score_image, self.score_rect),
+                (self.high_score_image, self.high_score_rect),
+                (self.level_image, self.level_rect)] + self.ship_blits
         
         
     def check_high_score(self):
@@ -1,3 +1,21 @@
+# Builds the path of the folder the scores are saved in
+import os
+
+# Tells which system's folder for saved data to use
+import sys
+
+
+def user_data_dir():
+    """Return the folder the game saves this user's data in, in the usual place for the system."""
+    if sys.platform == 'win32':
+        base = os.environ.get('APPDATA') or os.path.expanduser('~')
+    elif sys.platform == 'darwin':
+        base = os.path.expanduser('~/Library/Application Support')
+    else:
+        base = os.environ.get('XDG_DATA_HOME') or os.path.expanduser('~/.local/share')
+    return os.path.join(base, 'alien_invasion')
+
+
 class Settings:
     """ A class to store all settings for Alien Invasion."""
     
@@ -8,9 +26,64 @@ class Settings:
         self.screen_width = 1200
         self.screen_height = 800
         self.bg_color = (230, 230, 230)
+        # The game is always played and drawn at screen_width x screen_height. scale_mode shows it
+        # bigger: 'hardware' has SDL scale it on the GPU (pygame.SCALED, with vsync), and 'software'
+        # scales each frame with a blit into a window of window_size. None shows it unscaled.
+        self.scale_mode = None
+        # Window size for 'software' scaling; None uses the desktop size when fullscreen.
+        self.window_size = None
+        self.fullscreen = False
+        # Update only the changed parts of the display each frame, instead of flipping the whole screen.
+        self.dirty_rendering = False
+        
+        # Frame timing
+        # Most frames drawn per second; 0 draws as fast as the machine allows.
+        self.frame_rate = 60
+        # Fixed number of game-logic ticks per second, no matter how fast frames are drawn.
+        self.tick_rate = 60
+        # The ship, bullet and alien speeds are in pixels per tick at this tick rate.
+        self.speed_tick_rate = 60
+        # Draw moving objects between their last two tick positions, for smoother motion.
+        self.interpolate_rendering = False
+        
+        # Profiling
+        # Time each phase of every frame; F3 shows the results on screen.
+        self.profile = False
+        # Number of recent frames kept for the profiler's stats.
+        self.profile_frames = 600
+        # File the profile is written to on exit, as CSV or JSON depending on its extension; None skips it.
+        self.profile_export = 'profile.json'
+        
+        # Startup
+        # Print how long the game took to show its first frame, counted from before pygame was imported.
+        self.report_startup = False
+        
+        # Saved scores
+        # File the high score and finished games are saved to; None saves nothing. It is kept in the
+        # user's own data folder, so the same scores are used whichever folder the game is started
+        # from, and the game's folder doesn't need to be writable.
+        self.scores_path = os.path.join(user_data_dir(), 'scores.json')
+        # Fewest seconds between writes of the scores file.
+        self.scores_write_interval = 5.0
+        
+        # Telemetry
+        # File every game start, kill, ship hit, level-up and game over is added to, session after session; None logs nothing.
+        self.telemetry_path = None
+        # Events held in memory before new ones are dropped, if the file falls behind.
+        self.telemetry_capacity = 4096
+        # Seconds between batches written to the file.
+        self.telemetry_flush_interval = 1.0
+        
+        # Recording
+        # File every tick's input is recorded to, for replay.py to play back; None records nothing.
+        self.record_path = None
         
         # Ship settings
         self.ship_limit = 3
+        # Seconds the game pauses after the ship is hit.
+        self.respawn_pause = 0.5
+        # Seconds the game pauses after a fleet is cleared, before the next level moves.
+        self.level_transition_pause = 0.0
         
         # Bullet settings  
         self.bullet_width = 3
@@ -20,6 +93,10 @@ class Settings:
         
         # Alien settings
         self.fleet_drop_speed = 10
+        # Fleet backend: 'sprites' uses one Alien sprite per alien, 'numpy' keeps the fleet in NumPy arrays.
+        self.fleet_backend = 'sprites'
+        # Draw the fleet from one cached Surface in a single blit, instead of one blit per alien.
+        self.cached_fleet_rendering = True
 
         # How quickly the game speeds up
         self.speedup_scale = 1.1
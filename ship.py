@@ -1,7 +1,9 @@
-# Imports the pygame module before defining the class.
-import pygame
+# Imports the Sprite class from pygame
 from pygame.sprite import Sprite
 
+# Imports the shared image loader from the assets.py file
+from assets import load_image
+
 
 class Ship(Sprite):
     """A class to manage the ship."""
@@ -17,8 +19,8 @@ class Ship(Sprite):
         # Accesses the screens rect attribute and assigns it to self.screen_rect (rect = rectangle)
         self.screen_rect = ai_game.screen.get_rect()
         
-        # Load the ship image and get its rect.
-        self.image = pygame.image.load('python_projects/alieninvasion/images/ship.bmp')
+        # Get the shared ship image from the asset cache and get its rect.
+        self.image = load_image('ship.bmp')
         self.rect = self.image.get_rect()
         
         # Start each new ship at the bottom center of the screen.
@@ -26,33 +28,47 @@ class Ship(Sprite):
         
         # Store a decimal value for the ship's horizontal position, float() converts value of self.rect to a decimal and assigns the value to self.x
         self.x = float(self.rect.x)
+        # Where the ship was on the previous tick, for drawing in between ticks.
+        self.previous_x = self.x
         
         # Movement flags
         self.moving_right = False
         self.moving_left = False
         
         
-    def update(self):
-        """Update the ship's position based on the movement flags."""
+    def update(self, dt=1.0):
+        """Update the ship's position based on the movement flags, for a tick dt long."""
         
+        self.previous_x = self.x
         ## Update the ship's x value, not the rect. 
         # Moves the ship right if true, but limits to right edge of screen
         if self.moving_right and self.rect.right < self.screen_rect.right:
-            self.x += self.settings.ship_speed
+            self.x += self.settings.ship_speed * dt
         # Moves the ship left if true, but limits to left edge of screen (0 = left edge of screen in pygame)
         if self.moving_left and self.rect.left > 0:
-            self.x -= self.settings.ship_speed
+            self.x -= self.settings.ship_speed * dt
             
         # Update rect object from self.x
         self.rect.x = self.x
         
         
-    def blitme(self):
-        """Draw the ship at its current location."""
+    def blit_item(self, alpha=1.0):
+        """Return the image and rect that draw the ship alpha of the way from its last position to its current one."""
+        
+        rect = self.rect
+        # Blends the last two positions, so movement looks smooth between ticks.
+        if alpha < 1.0:
+            rect = rect.copy()
+            rect.x = self.previous_x + (self.x - self.previous_x) * alpha
+        return self.image, rect
         
-        self.screen.blit(self.image, self.rect)
+        
+    def blitme(self, alpha=1.0):
+        """Draw the ship alpha of the way from its last position to its current one, and return its rect."""
+        return self.screen.blit(*self.blit_item(alpha))
         
     def center_ship(self):
         """Center the ship on the screen."""
         self.rect.midbottom = self.screen_rect.midbottom
-        self.x = float(self.rect.x)
\ No newline at end of file
+        self.x = float(self.rect.x)
+        self.previous_x = self.x
\ No newline at end of file
@@ -0,0 +1,274 @@
+# Lets us describe one tick of player input as a small, immutable record
+from collections import namedtuple
+
+# Contains functionality to make game
+import pygame
+
+# Imports the Settings class from the settings.py file
+from settings import Settings
+
+# Imports the Ship class from the ship.py file
+from ship import Ship
+
+# Imports the Bullet class from the bullet.py file
+from bullet import Bullet
+
+# Imports the sprite group that reuses its sprites
+from pool import PooledGroup
+
+# Imports the fleet backends from the fleet.py file
+from fleet import make_fleet
+
+# Creates instance of GameStats, and imports the pause states
+from game_stats import GameStats, STATE_PLAYING, STATE_RESPAWN, STATE_LEVEL_TRANSITION
+
+
+# The player's input for a single tick: held arrow keys, a fire press, and a click on the Play button.
+Inputs = namedtuple('Inputs', ['left', 'right', 'fire', 'play'], defaults=[False, False, False, False])
+
+# A tick where the player does nothing.
+NO_INPUT = Inputs()
+
+# Names of the events a tick can raise, so a renderer (or anything else) can react to them.
+GAME_STARTED = 'game_started'
+ALIENS_KILLED = 'aliens_killed'
+LEVEL_UP = 'level_up'
+SHIP_HIT = 'ship_hit'
+GAME_OVER = 'game_over'
+
+
+class Simulation:
+    """Run the rules of Alien Invasion one fixed tick at a time, without a window."""
+
+    def __init__(self, settings=None, screen=None, create_fleet=True):
+        """Create the game objects, drawing onto screen if one is given.
+
+        A fleet is only for show until a game starts, so create_fleet=False leaves it to be made later.
+        """
+
+        # Uses the given settings, or the defaults from the settings.py file
+        self.settings = settings if settings is not None else Settings()
+
+        # Headless games get a plain Surface, so sprites can measure the screen without opening a window.
+        if screen is None:
+            screen = pygame.Surface((self.settings.screen_width, self.settings.screen_height))
+        self.screen = screen
+
+        # Create instance to store game statistics.
+        self.stats = GameStats(self)
+
+        # Call to Ship(), gives Ship access to the simulation's screen and settings
+        self.ship = Ship(self)
+
+        # Group for the bullets, which reuses spent bullets, and the fleet of aliens chosen in the settings
+        self.bullets = PooledGroup(lambda: Bullet(self))
+        self.fleet = make_fleet(self)
+
+        # Events raised during the most recent tick, and the number of aliens it killed.
+        self.events = []
+        self.kills = 0
+
+        # Number of ticks simulated so far.
+        self.ticks = 0
+
+        # Length of one tick, relative to the tick rate the speed settings are measured at.
+        self.dt = self.settings.speed_tick_rate / self.settings.tick_rate
+
+        if create_fleet:
+            self.create_fleet()
+
+
+    def step(self, inputs=NO_INPUT):
+        """Advance the game by one tick and return the events it raised."""
+        self.events = []
+        self.kills = 0
+
+        # Apply the held movement keys to the ship.
+        self.ship.moving_left = inputs.left
+        self.ship.moving_right = inputs.right
+
+        # A click on Play starts a new game when one isn't already running.
+        if inputs.play and not self.stats.game_active:
+            self.start_game()
+
+        # Fires a bullet from the ship, unless play is paused
+        if inputs.fire and not self.stats.paused:
+            self._fire_bullet()
+
+        if self.stats.state == STATE_PLAYING:
+            # Moves the ship, bullets and aliens by one tick
+            self.ship.update(self.dt)
+            self._update_bullets()
+            self._update_aliens()
+        else:
+            # Nothing moves, so nothing is drawn part way through a move either.
+            self._hold_still()
+            if self.stats.paused:
+                # A pause just counts down.
+                self.stats.update_pause()
+
+        self.ticks += 1
+        return self.events
+
+
+    def _hold_still(self):
+        """Mark the ship, bullets and aliens as not having moved since the last tick."""
+        self.fleet.last_shift = 0.0
+        self.ship.previous_x = self.ship.x
+        for bullet in self.bullets.sprites():
+            bullet.previous_y = bullet.y
+
+
+    def start_game(self):
+        """Reset the settings and statistics and start a new game."""
+        # Reset the game settings.
+        self.settings.initialize_dynamic_settings()
+
+        # Reset the game statistics.
+        self.stats.reset_stats()
+        self.stats.game_active = True
+
+        # Get rid of any remaining bullets.
+        self.bullets.empty()
+
+        # Swap in a new fleet in place of any remaining aliens, and center the ship.
+        self.create_fleet()
+        self.ship.center_ship()
+
+        self.events.append(GAME_STARTED)
+
+
+    def create_fleet(self):
+        """ Create the fleet of aliens, replacing any remaining aliens"""
+        self.fleet.create()
+
+
+    def prepare_next_fleet(self):
+        """Build the next fleet ahead of time, so a cleared wave or ship hit only has to swap it in."""
+        self.fleet.prepare()
+
+
+    def _check_fleet_edges(self):
+        """ Respond appropriately if any aliens have reached an edge"""
+        if self.fleet.at_edge():
+            # If at_edge() returns TRUE, fleet is at edge and reverses direction.
+            self._change_fleet_direction()
+
+
+    def _change_fleet_direction(self):
+        """ Drop the entire fleet and change the fleet's direction"""
+        # Drops every alien using the setting fleet_drop_speed
+        self.fleet.drop(self.settings.fleet_drop_speed)
+        # Changes fleet direction by multiplying valuse of fleet_direction current value by -1
+        self.settings.fleet_direction *= -1
+
+
+    def _update_aliens(self):
+        """ Check if the fleet is at the edge, then update the positions of all aliens in the fleet"""
+        # Calls the _check_fleet_edges
+        self._check_fleet_edges()
+        # Update alien fleet
+        self.fleet.update(self.dt)
+
+        # Look for alien-ship collisions.
+        if self.fleet.collides_with(self.ship):
+            self._ship_hit()
+
+        # Look for aliens hitting the bottom of the screen.
+        self._check_aliens_bottom()
+
+
+    def _ship_hit(self):
+        """ Respond to the ship being hit by an alien"""
+        # Loop checks the players ship count left, to continue to next ship if TRUE.
+        if self.stats.ships_left > 0:
+            # Decrement ships_left.
+            self.stats.ships_left -= 1
+
+            # Get rid of any remaining bullets.
+            self.bullets.empty()
+
+            # Swap in a new fleet in place of any remaining aliens, and center the ship.
+            self.create_fleet()
+            self.ship.center_ship()
+
+            # Pauses play for the time set in settings.py, without stopping the game loop.
+            self._pause(STATE_RESPAWN, self.settings.respawn_pause)
+
+            self.events.append(SHIP_HIT)
+
+        # If zero ships left, active game changed to FALSE.
+        else:
+            self.stats.game_active = False
+            self.events.append(GAME_OVER)
+
+
+    def _check_aliens_bottom(self):
+        """Check is any aliens have reached the bottom of the screen"""
+        screen_rect = self.screen.get_rect()
+        if self.fleet.reached_bottom(screen_rect.bottom):
+            # Treat this the same as if the ship got hit.
+            self._ship_hit()
+
+
+    def _fire_bullet(self):
+        """ Create a new bullet and add it to the bullets group"""
+
+        # When fired, checks that len(self.bullets) is less than the bullets allowed in settings.py, if so creates a new bullet.
+        if len(self.bullets) < self.settings.bullets_allowed:
+            # Reuses a spent bullet, or creates a new instance of Bullet if there isn't one
+            new_bullet = self.bullets.acquire()
+            new_bullet.reset()
+            # Adds new bullet to the group
+            # add() method is similar to append(), but its a method written specifically for Pygame groups
+            self.bullets.add(new_bullet)
+
+
+    def _update_bullets(self):
+        """ Update position of bullets and get rid of old bullets"""
+
+        # Update bullet positions
+        self.bullets.update(self.dt)
+        # Get rid of bullets that have disappeared off the top of the screen.
+        # Every bullet moves at the same speed, so the oldest bullet is always the highest one;
+        # checking from the oldest and stopping at the first one still on screen avoids copying the group.
+        bullets = self.bullets.spritedict
+        while bullets:
+            bullet = next(iter(bullets))
+            if bullet.rect.bottom > 0:
+                break
+            # Removes bullets that have disappeared from the screen
+            self.bullets.remove(bullet)
+
+        self._check_bullet_alien_collisions()
+
+
+    def _check_bullet_alien_collisions(self):
+        """ Respond to bullet-alien collisions"""
+
+        # Remove any bullets and aliens that have collided
+        aliens_hit = self.fleet.collide_bullets(self.bullets)
+
+        # Adds points to score as alien ships shot down.
+        if aliens_hit:
+            self.stats.score += self.settings.alien_points * aliens_hit
+            self.kills += aliens_hit
+            self.events.append(ALIENS_KILLED)
+
+        if not self.fleet:
+            # Destroy existing bullets and create new fleet
+            self.bullets.empty()
+            self.create_fleet()
+            self.settings.increase_speed()
+
+            # Increase level.
+            self.stats.level += 1
+            self.events.append(LEVEL_UP)
+
+            # Pauses before the next level, for the time set in settings.py.
+            self._pause(STATE_LEVEL_TRANSITION, self.settings.level_transition_pause)
+
+
+    def _pause(self, state, seconds):
+        """Pause play in state for the given number of seconds of game time."""
+        self.stats.start_pause(state, round(seconds * self.settings.tick_rate))
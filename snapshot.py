@@ -0,0 +1,161 @@
+"""Save the whole state of a running game into one flat buffer, and put a game back into that state.
+
+A snapshot is a fixed header holding the statistics, the settings that change during play, the
+ship and the fleet's offsets, followed by the living aliens and the bullets packed into arrays.
+Nothing is pickled, so taking a snapshot every frame for rewinding or reproducing a crash is cheap.
+Snapshots use the machine's own byte order, and only restore into a game of the same screen size.
+
+Usage:
+    python snapshot.py midgame.snapshot --ticks 20000    play headless, then save the game's state
+
+benchmark.py --snapshot midgame.snapshot then starts its scenarios from that state.
+"""
+
+# Packs the living aliens and bullets into flat arrays
+from array import array
+
+# Reads the command line options
+import argparse
+
+# Packs the header's fixed-size fields
+import struct
+
+# Imports the game states a snapshot can be taken in
+from game_stats import STATE_GAME_OVER, STATE_PLAYING, STATE_RESPAWN, STATE_LEVEL_TRANSITION
+
+
+# First bytes of every snapshot, followed by the format version.
+MAGIC = b'AISS'
+VERSION = 1
+
+# The game states, stored by their position in this tuple.
+STATES = (STATE_GAME_OVER, STATE_PLAYING, STATE_RESPAWN, STATE_LEVEL_TRANSITION)
+
+# Header: magic, version, screen width and height, tick count; game state, ticks left in its
+# pause, ships left, level, score and high score; ship, bullet and alien speeds, fleet direction
+# and alien points; the ship's exact x, last x, rect position and movement keys; the fleet's
+# drop, last sideways move and column index offset; then the number of aliens and bullets.
+# It is padded to a multiple of 8 bytes, so the arrays after it stay aligned.
+HEADER = struct.Struct('=4sHHHQ BiiiqqddddqddiiBB idd II 3x')
+
+
+def take_snapshot(sim):
+    """Return the state of sim, a Simulation, as bytes."""
+    stats = sim.stats
+    settings = sim.settings
+    ship = sim.ship
+    fleet = sim.fleet
+
+    positions, xs = fleet.alien_state()
+    bullet_positions = array('i')
+    bullet_ys = array('d')
+    bullets = sim.bullets.sprites()
+    for bullet in bullets:
+        bullet_positions.extend((bullet.rect.x, bullet.rect.y))
+        bullet_ys.extend((bullet.y, bullet.previous_y))
+
+    header = HEADER.pack(
+        MAGIC, VERSION, settings.screen_width, settings.screen_height, sim.ticks,
+        STATES.index(stats.state), stats.state_ticks, stats.ships_left, stats.level, stats.score,
+        stats.high_score,
+        settings.ship_speed, settings.bullet_speed, settings.alien_speed, settings.fleet_direction,
+        settings.alien_points,
+        ship.x, ship.previous_x, ship.rect.x, ship.rect.y, ship.moving_left, ship.moving_right,
+        fleet.offset_y, fleet.last_shift, fleet.index.offset_x,
+        len(xs), len(bullets))
+    # The 8-byte floats go first, so they stay aligned.
+    return b''.join((header, xs.tobytes(), bullet_ys.tobytes(), positions.tobytes(),
+                     bullet_positions.tobytes()))
+
+
+def restore_snapshot(sim, data):
+    """Put sim, a Simulation, back into the state saved in data by take_snapshot()."""
+    (magic, version, screen_width, screen_height, ticks,
+     state, state_ticks, ships_left, level, score, high_score,
+     ship_speed, bullet_speed, alien_speed, fleet_direction, alien_points,
+     ship_x, ship_previous_x, ship_left, ship_top, moving_left, moving_right,
+     offset_y, last_shift, index_offset,
+     alien_count, bullet_count) = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('not an Alien Invasion snapshot')
+    settings = sim.settings
+    if (screen_width, screen_height) != (settings.screen_width, settings.screen_height):
+        raise ValueError('snapshot is of a {}x{} game, not {}x{}'.format(
+            screen_width, screen_height, settings.screen_width, settings.screen_height))
+
+    # Views the arrays in place, in the order take_snapshot() wrote them.
+    view = memoryview(data)
+    position = HEADER.size
+    arrays = []
+    for count, code in ((alien_count, 'd'), (bullet_count * 2, 'd'), (alien_count * 4, 'i'),
+                        (bullet_count * 2, 'i')):
+        end = position + count * struct.calcsize(code)
+        arrays.append(view[position:end].cast(code))
+        position = end
+    xs, bullet_ys, positions, bullet_positions = arrays
+
+    sim.ticks = ticks
+    sim.events = []
+    sim.kills = 0
+
+    stats = sim.stats
+    stats.state = STATES[state]
+    stats.state_ticks = state_ticks
+    stats.ships_left = ships_left
+    stats.level = level
+    stats.score = score
+    stats.high_score = high_score
+
+    settings.ship_speed = ship_speed
+    settings.bullet_speed = bullet_speed
+    settings.alien_speed = alien_speed
+    settings.fleet_direction = int(fleet_direction)
+    settings.alien_points = alien_points
+
+    ship = sim.ship
+    ship.x = ship_x
+    ship.previous_x = ship_previous_x
+    ship.rect.x = ship_left
+    ship.rect.y = ship_top
+    ship.moving_left = bool(moving_left)
+    ship.moving_right = bool(moving_right)
+
+    sim.fleet.restore(positions, xs, offset_y, last_shift, index_offset)
+
+    # Rebuilds the bullets in one batch, oldest first, reusing spent ones.
+    bullets = sim.bullets
+    bullets.empty()
+    restored = bullets.acquire_many(bullet_count)
+    for number, bullet in enumerate(restored):
+        bullet.rect.x = bullet_positions[number * 2]
+        bullet.rect.y = bullet_positions[number * 2 + 1]
+        bullet.y = bullet_ys[number * 2]
+        bullet.previous_y = bullet_ys[number * 2 + 1]
+    bullets.add_many(restored)
+
+
+def main():
+    """Play a headless game with the scripted player, and save its state at the chosen tick."""
+    # Imported here, so restoring a snapshot doesn't pull in the scripted players.
+    from simulation import Simulation, Inputs
+    from policies import SweepAndFire
+
+    parser = argparse.ArgumentParser(description='Save a snapshot of a headless Alien Invasion game.')
+    parser.add_argument('output', help='snapshot file to write')
+    parser.add_argument('--ticks', type=int, default=20000, help='ticks to play before saving')
+    args = parser.parse_args()
+
+    sim = Simulation()
+    sim.step(Inputs(play=True))
+    player = SweepAndFire()
+    for _ in range(args.ticks):
+        sim.step(player(sim))
+    data = take_snapshot(sim)
+    with open(args.output, 'wb') as f:
+        f.write(data)
+    print('Saved tick {} (level {}, score {:,}, {} aliens) to {} ({:,} bytes)'.format(
+        sim.ticks, sim.stats.level, sim.stats.score, len(sim.fleet), args.output, len(data)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+class ColumnIndex:
+    """Buckets the aliens of a fleet by grid column, so a bullet only checks the aliens above it."""
+
+    # Extra pixels searched on each side of a bullet, covering aliens whose rounded position
+    # is a pixel off from the fleet's shared offset.
+    margin = 2
+
+    def __init__(self, origin_x, column_width, item_width):
+        """Create an empty index for a grid whose first column starts at origin_x."""
+        self.origin_x = origin_x
+        self.column_width = column_width
+        self.item_width = item_width
+
+        # One set of items per column.
+        self.columns = []
+
+        # How far the whole fleet has moved sideways since the grid was built.
+        self.offset_x = 0.0
+
+
+    def column_of(self, x):
+        """Return the column that starts at the grid position x."""
+        return (x - self.origin_x) // self.column_width
+
+
+    def build(self, items):
+        """Fill the index from (x, item) pairs, where x is each item's starting grid position."""
+        self.columns = []
+        self.offset_x = 0.0
+        for x, item in items:
+            column = self.column_of(x)
+            # Adds empty columns until this item's column exists.
+            while len(self.columns) <= column:
+                self.columns.append(set())
+            self.columns[column].add(item)
+
+
+    def fill(self, columns):
+        """Fill the index from the items in each column, in column order, already bucketed."""
+        self.columns = [set(column) for column in columns]
+        self.offset_x = 0.0
+
+
+    def clear(self):
+        """Remove every item from the index."""
+        self.columns = []
+        self.offset_x = 0.0
+
+
+    def shift(self, distance):
+        """Record the fleet moving sideways by distance."""
+        self.offset_x += distance
+
+
+    def remove(self, x, item):
+        """Remove an item that started at grid position x."""
+        self.columns[self.column_of(x)].discard(item)
+
+
+    def candidates(self, left, right):
+        """Return the items in every column that could overlap the screen span left to right."""
+        # Converts the screen span back into the grid's own coordinates.
+        left = left - self.offset_x - self.margin
+        right = right - self.offset_x + self.margin
+        first = max(int((left - self.item_width - self.origin_x) // self.column_width), 0)
+        last = min(int((right - self.origin_x) // self.column_width), len(self.columns) - 1)
+        found = []
+        for column in range(first, last + 1):
+            found.extend(self.columns[column])
+        return found
@@ -0,0 +1,139 @@
+"""Record gameplay events into a fixed-size in-memory ring, written to disk in batches by a background thread.
+
+Each event is one fixed-size binary record. The game thread only packs the record into a
+preallocated buffer, so logging an event never allocates or makes a system call. When the writer
+falls behind and the ring fills up, new events are dropped and counted instead of waiting.
+"""
+
+# Stores the records side by side in one preallocated buffer
+import struct
+
+# Drains the ring to disk in the background
+import threading
+
+# Stamps each record with when it happened
+import time
+
+# Imports the names of the simulation's events
+from simulation import GAME_STARTED, ALIENS_KILLED, LEVEL_UP, SHIP_HIT, GAME_OVER
+
+
+MAGIC = b'AITL'
+VERSION = 1
+
+# File header: magic and version.
+HEADER = struct.Struct('<4sH')
+
+# One event: wall-clock time, simulation tick, event code, level, value, score, padded to 32 bytes.
+RECORD = struct.Struct('<dIHHiq4x')
+
+# Event codes stored in the records. DROPPED is written once, when the log closes, with the
+# number of events dropped as its value.
+DROPPED = 0
+EVENT_CODES = {
+    GAME_STARTED: 1,
+    ALIENS_KILLED: 2,
+    LEVEL_UP: 3,
+    SHIP_HIT: 4,
+    GAME_OVER: 5,
+}
+EVENT_NAMES = {code: name for name, code in EVENT_CODES.items()}
+EVENT_NAMES[DROPPED] = 'dropped'
+
+
+class TelemetryLog:
+    """A ring of fixed-size event records, drained to a file by a writer thread."""
+
+    def __init__(self, path, capacity=4096, flush_interval=1.0):
+        """Open path for adding events to, and start the writer thread."""
+        self.path = path
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+
+        # The ring. Records are written at head and read from tail; both only ever count up, and
+        # only the game thread moves head and only the writer moves tail, so neither needs a lock.
+        self.buffer = bytearray(capacity * RECORD.size)
+        self.head = 0
+        self.tail = 0
+
+        # Events that arrived while the ring was full.
+        self.dropped = 0
+
+        # Bound once, so logging doesn't look them up on every event.
+        self._pack = RECORD.pack_into
+        self._clock = time.time
+        self._size = RECORD.size
+
+        # Each session's events are added after the ones already in the file.
+        self.file = open(path, 'ab')
+        size = self.file.tell()
+        if size < HEADER.size:
+            # A new file, or one that never got its whole header.
+            self.file.truncate(0)
+            self.file.write(HEADER.pack(MAGIC, VERSION))
+        elif (size - HEADER.size) % RECORD.size:
+            # A session that stopped part way through writing a record leaves part of it behind,
+            # which would put every later record out of step.
+            self.file.truncate(size - (size - HEADER.size) % RECORD.size)
+
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='TelemetryLog', daemon=True)
+        self._thread.start()
+
+
+    def log(self, event, tick, level, value, score):
+        """Add one event to the ring, or count it as dropped if the ring is full."""
+        head = self.head
+        if head - self.tail >= self.capacity:
+            self.dropped += 1
+            return
+        self._pack(self.buffer, (head % self.capacity) * self._size,
+                   self._clock(), tick, EVENT_CODES[event], level, value, score)
+        self.head = head + 1
+
+
+    def close(self):
+        """Write every event still in the ring, and the dropped count, then close the file."""
+        self._stop.set()
+        self._thread.join()
+        self._drain()
+        self.file.write(RECORD.pack(time.time(), 0, DROPPED, 0, self.dropped, 0))
+        self.file.close()
+
+
+    def _run(self):
+        """Drain the ring to the file once every flush_interval seconds, until the log is closed."""
+        while not self._stop.wait(self.flush_interval):
+            self._drain()
+
+
+    def _drain(self):
+        """Write the records between tail and head to the file in one batch."""
+        head, tail = self.head, self.tail
+        if head == tail:
+            return
+        size = RECORD.size
+        start = (tail % self.capacity) * size
+        end = (head % self.capacity) * size
+        view = memoryview(self.buffer)
+        # The records may wrap around the end of the buffer.
+        if start < end:
+            self.file.write(view[start:end])
+        else:
+            self.file.write(view[start:])
+            self.file.write(view[:end])
+        self.file.flush()
+        # Only now can the game thread reuse these slots.
+        self.tail = head
+
+
+def read_events(path):
+    """Yield each event in a telemetry file as a dict."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, version = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('{} is not a telemetry file'.format(path))
+    for when, tick, code, level, value, score in RECORD.iter_unpack(data[HEADER.size:]):
+        yield {'time': when, 'tick': tick, 'event': EVENT_NAMES.get(code, code),
+               'level': level, 'value': value, 'score': score}
@@ -0,0 +1,88 @@
+import pygame.font
+
+
+# Fonts already created, keyed by size, so every part of the HUD shares them.
+_fonts = {}
+
+# Glyph atlases already built, keyed by font size and colors.
+_atlases = {}
+
+
+def get_font(size):
+    """Return the shared default font at the given size."""
+    font = _fonts.get(size)
+    if font is None:
+        # SysFont(None) gives this same default font, but first scans every font installed on the system.
+        font = pygame.font.Font(None, size)
+        _fonts[size] = font
+    return font
+
+
+def get_atlas(size, text_color, bg_color):
+    """Return the shared glyph atlas for digits in the given size and colors."""
+    key = (size, tuple(text_color), tuple(bg_color))
+    atlas = _atlases.get(key)
+    if atlas is None:
+        atlas = GlyphAtlas(get_font(size), text_color, bg_color)
+        _atlases[key] = atlas
+    return atlas
+
+
+class GlyphAtlas:
+    """A set of characters rendered once into a single Surface, used to build numbers by blitting."""
+
+    # Most recently built images kept, since the score, high score and level often repeat a string.
+    cache_size = 64
+
+    def __init__(self, font, text_color, bg_color, chars='0123456789,'):
+        """Render each character once and pack them side by side into the atlas."""
+        self.font = font
+        self.text_color = text_color
+        self.bg_color = bg_color
+
+        glyphs = [font.render(char, True, text_color, bg_color) for char in chars]
+        self.height = max(glyph.get_height() for glyph in glyphs)
+        self.image = pygame.Surface((sum(glyph.get_width() for glyph in glyphs), self.height))
+        self.image.fill(bg_color)
+
+        # Where each character sits inside the atlas, and how wide it is.
+        self.areas = {}
+        self.widths = {}
+        x = 0
+        for char, glyph in zip(chars, glyphs):
+            self.image.blit(glyph, (x, 0))
+            self.areas[char] = pygame.Rect(x, 0, glyph.get_width(), self.height)
+            self.widths[char] = glyph.get_width()
+            x += glyph.get_width()
+
+        # Images already built, keyed by their text.
+        self._cache = {}
+
+
+    def render(self, text):
+        """Return an image of text, built from the atlas without rasterizing the font."""
+        image = self._cache.get(text)
+        if image is not None:
+            return image
+
+        widths = self.widths
+        try:
+            width = sum([widths[char] for char in text])
+        except KeyError:
+            # Anything the atlas doesn't hold is drawn by the font instead.
+            return self.font.render(text, True, self.text_color, self.bg_color)
+
+        # Copies each character's area of the atlas into place, in one batch of blits.
+        image = pygame.Surface((width, self.height), 0, self.image)
+        atlas, areas = self.image, self.areas
+        blits = []
+        x = 0
+        for char in text:
+            blits.append((atlas, (x, 0), areas[char]))
+            x += widths[char]
+        image.blits(blits, doreturn=False)
+
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        self._cache[text] = image
+        return image
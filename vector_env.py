@@ -0,0 +1,323 @@
+"""Many independent games of Alien Invasion, kept in NumPy arrays and stepped together.
+
+Each game follows the same rules as Simulation.step(): the ship and bullet moves of the
+ship.py and bullet.py files, the collisions and level-ups of _update_bullets(), the fleet
+moves and drops of _update_aliens(), _ship_hit(), and Settings.increase_speed(). Games
+that end are started again straight away, so every game is always playing.
+
+    env = VectorEnv(256)
+    observations = env.reset()
+    observations, rewards, dones = env.step(actions)
+
+actions holds one number per game, made by adding together LEFT, RIGHT and FIRE.
+"""
+
+# Resets the starting dynamic settings on a copy of the settings
+import copy
+
+# Every game's state lives in arrays, so all the games move in a handful of array operations
+import numpy as np
+
+# Imports the Settings class from the settings.py file
+from settings import Settings
+
+# Imports the shared image loader, which gives the ship and alien sizes
+from assets import load_image
+
+# Imports the grid layout the fleet is built from
+from fleet import fleet_slots
+
+
+# Action bits: add these together to hold several keys at once.
+LEFT = 1
+RIGHT = 2
+FIRE = 4
+
+
+def _round(values):
+    """Round to whole pixels the way pygame Rects do, with halves going away from zero."""
+    return (np.sign(values) * np.floor(np.abs(values) + 0.5)).astype(np.int64)
+
+
+class VectorEnv:
+    """num_envs games of Alien Invasion, all moved by one call to step()."""
+
+    def __init__(self, num_envs, settings=None):
+        """Create num_envs games sharing the same settings, and start them all."""
+        self.num_envs = num_envs
+        self.settings = settings if settings is not None else Settings()
+        settings = self.settings
+
+        # Length of one tick, relative to the tick rate the speed settings are measured at.
+        self.dt = settings.speed_tick_rate / settings.tick_rate
+
+        # Sizes of the screen, ship, bullets and aliens, which the rules need.
+        self.screen_width = settings.screen_width
+        self.screen_height = settings.screen_height
+        self.ship_width, self.ship_height = load_image('ship.bmp').get_size()
+        self.alien_width, self.alien_height = load_image('alien.bmp').get_size()
+        self.ship_top = self.screen_height - self.ship_height
+        self.ship_start_x = self.screen_width // 2 - self.ship_width // 2
+
+        # Every fleet starts from the same grid, so each alien's start is worked out once.
+        slots = fleet_slots(settings, (self.alien_width, self.alien_height), self.ship_height)
+        self.column_x = np.array(sorted({x for x, y in slots}), dtype=np.int64)
+        self.row_y = np.array(sorted({y for x, y in slots}), dtype=np.int64)
+        self.rows, self.columns = len(self.row_y), len(self.column_x)
+
+        # Ticks the pauses after a ship hit and a cleared level last.
+        self.respawn_ticks = round(settings.respawn_pause * settings.tick_rate)
+        self.level_ticks = round(settings.level_transition_pause * settings.tick_rate)
+
+        # Dynamic settings every game starts with, read the way a new game of Simulation resets them.
+        # They are reset on a copy, so the caller's settings keep whatever speeds they were given.
+        start = copy.copy(settings)
+        start.initialize_dynamic_settings()
+        self.start_ship_speed = start.ship_speed
+        self.start_bullet_speed = start.bullet_speed
+        self.start_alien_speed = start.alien_speed
+        self.start_fleet_direction = start.fleet_direction
+        self.start_alien_points = start.alien_points
+
+        # Per-game ship, bullets and fleet. Bullets are kept oldest first, with the free slots at the end.
+        k, b = num_envs, settings.bullets_allowed
+        self.ship_x = np.zeros(k)
+        self.bullet_x = np.zeros((k, b), dtype=np.int64)
+        self.bullet_y = np.zeros((k, b))
+        self.bullet_active = np.zeros((k, b), dtype=bool)
+        # The whole fleet moves in lockstep, so each column shares one exact horizontal position
+        # (kept per column, like each Alien's own x, so it rounds the same) and the fleet one downward offset.
+        self.alien_x = np.zeros((k, self.columns))
+        self.fleet_y = np.zeros(k, dtype=np.int64)
+        self.alive = np.zeros((k, self.rows, self.columns), dtype=bool)
+
+        # Per-game dynamic settings and statistics.
+        self.ship_speed = np.zeros(k)
+        self.bullet_speed = np.zeros(k)
+        self.alien_speed = np.zeros(k)
+        self.fleet_direction = np.zeros(k, dtype=np.int64)
+        self.alien_points = np.zeros(k, dtype=np.int64)
+        self.ships_left = np.zeros(k, dtype=np.int64)
+        self.score = np.zeros(k, dtype=np.int64)
+        self.level = np.zeros(k, dtype=np.int64)
+        self.pause_ticks = np.zeros(k, dtype=np.int64)
+
+        # Score and level each game ended on, kept after it restarts.
+        self.final_score = np.zeros(k, dtype=np.int64)
+        self.final_level = np.zeros(k, dtype=np.int64)
+
+        # Observations are written into one buffer: ship x, fleet x and y, fleet direction, ships
+        # left and pause ticks, then every bullet's x and y (-1 when unused), then the alive grid.
+        self.observation_size = 6 + 2 * b + self.rows * self.columns
+        self.observations = np.zeros((k, self.observation_size), dtype=np.float32)
+
+        self.reset()
+
+
+    def reset(self, mask=None):
+        """Start a new game in every game where mask is True (all of them by default), and return the observations."""
+        if mask is None:
+            mask = np.ones(self.num_envs, dtype=bool)
+        settings = self.settings
+
+        # The same resets as Settings.initialize_dynamic_settings() and GameStats.reset_stats().
+        self.ship_speed[mask] = self.start_ship_speed
+        self.bullet_speed[mask] = self.start_bullet_speed
+        self.alien_speed[mask] = self.start_alien_speed
+        self.fleet_direction[mask] = self.start_fleet_direction
+        self.alien_points[mask] = self.start_alien_points
+        self.ships_left[mask] = settings.ship_limit
+        self.score[mask] = 0
+        self.level[mask] = 1
+        self.pause_ticks[mask] = 0
+
+        self._new_fleet(mask)
+        self.bullet_active[mask] = False
+        self.ship_x[mask] = self.ship_start_x
+        return self._observe()
+
+
+    def step(self, actions):
+        """Advance every game by one tick with its action, and return the observations, rewards and dones.
+
+        The observations are written into the same buffer every step, so copy them to keep them.
+        """
+        actions = np.asarray(actions)
+        left = (actions & LEFT) != 0
+        right = (actions & RIGHT) != 0
+        fire = (actions & FIRE) != 0
+        score_before = self.score.copy()
+        dones = np.zeros(self.num_envs, dtype=bool)
+
+        # Fires a bullet from the ship, unless play is paused or every bullet is in flight.
+        self._fire(fire & (self.pause_ticks == 0))
+
+        playing = self.pause_ticks == 0
+        # Nothing moves during a pause; it just counts down.
+        self.pause_ticks[~playing] -= 1
+
+        self._update_ship(playing, left, right)
+        self._update_bullets(playing)
+        self._update_aliens(playing, dones)
+
+        rewards = (self.score - score_before).astype(np.float32)
+
+        # Games that ended start again, keeping what they finished on.
+        if dones.any():
+            self.final_score[dones] = self.score[dones]
+            self.final_level[dones] = self.level[dones]
+            self.reset(dones)
+        return self._observe(), rewards, dones
+
+
+    def _new_fleet(self, mask):
+        """Put a full fleet back at its starting slots in the masked games."""
+        self.alive[mask] = True
+        self.alien_x[mask] = self.column_x
+        self.fleet_y[mask] = 0
+
+
+    def _alien_left(self):
+        """Return the left edge of every column of aliens, per game."""
+        return _round(self.alien_x)
+
+
+    def _alien_top(self):
+        """Return the top edge of every row of aliens, per game."""
+        return self.row_y + self.fleet_y[:, None]
+
+
+    def _fire(self, mask):
+        """Add a bullet at the ship's nose in the masked games that have a free bullet slot."""
+        count = self.bullet_active.sum(axis=1)
+        mask = mask & (count < self.settings.bullets_allowed)
+        games = np.flatnonzero(mask)
+        slots = count[games]
+        # The same position Bullet.reset() gives, with the bullet's midtop at the ship's midtop.
+        ship_left = _round(self.ship_x[games])
+        self.bullet_x[games, slots] = ship_left + self.ship_width // 2 - self.settings.bullet_width // 2
+        self.bullet_y[games, slots] = self.ship_top
+        self.bullet_active[games, slots] = True
+
+
+    def _update_ship(self, mask, left, right):
+        """Move the ship in the masked games, stopping at the screen's edges like Ship.update()."""
+        ship_left = _round(self.ship_x)
+        step = self.ship_speed * self.dt
+        self.ship_x += np.where(mask & right & (ship_left + self.ship_width < self.screen_width), step, 0.0)
+        self.ship_x -= np.where(mask & left & (ship_left > 0), step, 0.0)
+
+
+    def _update_bullets(self, mask):
+        """Move the bullets, drop those off the top, and resolve hits on the aliens in the masked games."""
+        moving = self.bullet_active & mask[:, None]
+        self.bullet_y -= np.where(moving, (self.bullet_speed * self.dt)[:, None], 0.0)
+        bullet_top = _round(self.bullet_y)
+        self.bullet_active &= ~(moving & (bullet_top + self.settings.bullet_height <= 0))
+
+        # Each bullet slot is checked against every game at once, oldest bullet first like the sprite
+        # fleet, so an alien can only be hit by one bullet.
+        alien_left = self._alien_left()
+        alien_top = self._alien_top()
+        width, height = self.settings.bullet_width, self.settings.bullet_height
+        killed = np.zeros(self.num_envs, dtype=np.int64)
+        for slot in range(self.bullet_active.shape[1]):
+            active = self.bullet_active[:, slot] & mask
+            if not active.any():
+                continue
+            x = self.bullet_x[:, slot, None]
+            y = bullet_top[:, slot, None]
+            columns = (alien_left < x + width) & (x < alien_left + self.alien_width)
+            rows = (alien_top < y + height) & (y < alien_top + self.alien_height)
+            hits = self.alive & active[:, None, None] & rows[:, :, None] & columns[:, None, :]
+            hit_count = hits.sum(axis=(1, 2))
+            self.alive &= ~hits
+            self.bullet_active[:, slot] &= hit_count == 0
+            killed += hit_count
+        self.score += self.alien_points * killed
+        self._compact_bullets()
+
+        # A cleared fleet is replaced by a faster one, the same as Settings.increase_speed().
+        cleared = mask & ~self.alive.any(axis=(1, 2))
+        if cleared.any():
+            self.bullet_active[cleared] = False
+            self._new_fleet(cleared)
+            scale = self.settings.speedup_scale
+            self.ship_speed[cleared] *= scale
+            self.bullet_speed[cleared] *= scale
+            self.alien_speed[cleared] *= scale
+            self.alien_points[cleared] = (self.alien_points[cleared] * self.settings.score_scale).astype(np.int64)
+            self.level[cleared] += 1
+            if self.level_ticks > 0:
+                self.pause_ticks[cleared] = self.level_ticks
+
+
+    def _compact_bullets(self):
+        """Move the bullets still in flight to the front of each game's slots, keeping them oldest first."""
+        order = np.argsort(~self.bullet_active, axis=1, kind='stable')
+        self.bullet_x = np.take_along_axis(self.bullet_x, order, axis=1)
+        self.bullet_y = np.take_along_axis(self.bullet_y, order, axis=1)
+        self.bullet_active = np.take_along_axis(self.bullet_active, order, axis=1)
+
+
+    def _update_aliens(self, mask, dones):
+        """Turn the fleets at an edge, move every fleet, and check for hits on the ship in the masked games."""
+        # Only the outermost living columns can reach an edge.
+        living_columns = self.alive.any(axis=1)
+        any_alive = living_columns.any(axis=1)
+        first = np.argmax(living_columns, axis=1)
+        last = self.columns - 1 - np.argmax(living_columns[:, ::-1], axis=1)
+        alien_left = self._alien_left()
+        games = np.arange(self.num_envs)
+        at_edge = mask & any_alive & ((alien_left[games, first] <= 0)
+                                      | (alien_left[games, last] + self.alien_width >= self.screen_width))
+        self.fleet_y += np.where(at_edge, self.settings.fleet_drop_speed, 0)
+        self.fleet_direction[at_edge] *= -1
+
+        self.alien_x += np.where(mask, self.alien_speed * self.fleet_direction * self.dt, 0.0)[:, None]
+
+        # Look for alien-ship collisions.
+        alien_left = self._alien_left()
+        alien_top = self._alien_top()
+        ship_left = _round(self.ship_x)[:, None]
+        columns = (alien_left < ship_left + self.ship_width) & (ship_left < alien_left + self.alien_width)
+        rows = (alien_top < self.ship_top + self.ship_height) & (self.ship_top < alien_top + self.alien_height)
+        touching = (self.alive & rows[:, :, None] & columns[:, None, :]).any(axis=(1, 2))
+        self._ship_hit(mask & touching, dones)
+
+        # Look for aliens hitting the bottom of the screen, on the fleets left after any hit.
+        living_rows = self.alive.any(axis=2)
+        lowest = self.rows - 1 - np.argmax(living_rows[:, ::-1], axis=1)
+        bottom = self._alien_top()[games, lowest] + self.alien_height
+        self._ship_hit(mask & living_rows.any(axis=1) & (bottom >= self.screen_height), dones)
+
+
+    def _ship_hit(self, mask, dones):
+        """Take a ship from the masked games and start their fleet again, or end the games that had none left."""
+        over = mask & (self.ships_left == 0)
+        dones |= over
+        hit = mask & ~over
+        if not hit.any():
+            return
+        self.ships_left[hit] -= 1
+        self._new_fleet(hit)
+        self.bullet_active[hit] = False
+        self.ship_x[hit] = self.ship_start_x
+        if self.respawn_ticks > 0:
+            self.pause_ticks[hit] = self.respawn_ticks
+
+
+    def _observe(self):
+        """Write every game's state into the observation buffer and return it."""
+        obs = self.observations
+        b = self.bullet_active.shape[1]
+        obs[:, 0] = self.ship_x
+        obs[:, 1] = self.alien_x[:, 0] - self.column_x[0]
+        obs[:, 2] = self.fleet_y
+        obs[:, 3] = self.fleet_direction
+        obs[:, 4] = self.ships_left
+        obs[:, 5] = self.pause_ticks
+        obs[:, 6:6 + b] = np.where(self.bullet_active, self.bullet_x, -1)
+        obs[:, 6 + b:6 + 2 * b] = np.where(self.bullet_active, self.bullet_y, -1)
+        obs[:, 6 + 2 * b:] = self.alive.reshape(self.num_envs, -1)
+        return obs